@@ -0,0 +1,90 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+def sonuc_anahtari(prompt_surumu, model, baslik, aciklama, metin):
+    """Prompt sürümü, model ve haber içeriğinden önbellek anahtarı üret"""
+    parcalar = [str(prompt_surumu), model or '', baslik or '', aciklama or '', metin or '']
+    return hashlib.sha256('\x1f'.join(parcalar).encode('utf-8')).hexdigest()
+
+class AISonucOnbellegi:
+    """AI yeniden yazma sonuçları için kalıcı LRU/TTL önbellek (SQLite)
+
+    Aynı metin aynı prompt ve modelle tekrar yazdırılırsa Gemini'ye gidilmez.
+    Kayıtlar TTL süresince geçerlidir; kayıt sayısı max_kayit'ı aşınca en uzun
+    süredir kullanılmayanlar silinir.
+    """
+
+    def __init__(self, dosya='ai_sonuclari.db', max_kayit=2000, ttl_gun=30):
+        self.dosya = dosya
+        self.max_kayit = max_kayit
+        self.ttl_gun = ttl_gun
+        self._kilit = threading.Lock()
+        self.istatistik = {'isabet': 0, 'iskalama': 0, 'zorla': 0}
+
+        self.conn = sqlite3.connect(dosya, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS sonuclar (
+                anahtar TEXT PRIMARY KEY,
+                sonuc TEXT,
+                olusturma REAL,
+                son_erisim REAL
+            );
+            CREATE INDEX IF NOT EXISTS sonuclar_erisim ON sonuclar(son_erisim);
+        ''')
+        self.conn.commit()
+
+    def al(self, anahtar, zorla=False):
+        """Geçerli kayıt varsa sonucu döndür (erişim zamanı güncellenir)
+
+        zorla=True ise önbellek atlanır (yeniden üretim istendi).
+        """
+        if zorla:
+            with self._kilit:
+                self.istatistik['zorla'] += 1
+            return None
+
+        sinir = time.time() - self.ttl_gun * 86400
+        with self._kilit:
+            satir = self.conn.execute(
+                'SELECT sonuc FROM sonuclar WHERE anahtar = ? AND olusturma >= ?', (anahtar, sinir)
+            ).fetchone()
+            if satir is None:
+                self.istatistik['iskalama'] += 1
+                return None
+
+            self.istatistik['isabet'] += 1
+            self.conn.execute('UPDATE sonuclar SET son_erisim = ? WHERE anahtar = ?', (time.time(), anahtar))
+            self.conn.commit()
+        return json.loads(satir[0])
+
+    def kaydet(self, anahtar, sonuc):
+        simdi = time.time()
+        with self._kilit:
+            self.conn.execute('''
+                INSERT INTO sonuclar (anahtar, sonuc, olusturma, son_erisim) VALUES (?, ?, ?, ?)
+                ON CONFLICT(anahtar) DO UPDATE SET sonuc = excluded.sonuc,
+                    olusturma = excluded.olusturma, son_erisim = excluded.son_erisim
+            ''', (anahtar, json.dumps(sonuc, ensure_ascii=False), simdi, simdi))
+            self._temizle(simdi)
+            self.conn.commit()
+
+    def _temizle(self, simdi):
+        # Kilit altında çağrılır
+        self.conn.execute('DELETE FROM sonuclar WHERE olusturma < ?', (simdi - self.ttl_gun * 86400,))
+        fazla = self.conn.execute('SELECT COUNT(*) FROM sonuclar').fetchone()[0] - self.max_kayit
+        if fazla > 0:
+            self.conn.execute('''
+                DELETE FROM sonuclar WHERE anahtar IN (
+                    SELECT anahtar FROM sonuclar ORDER BY son_erisim LIMIT ?
+                )
+            ''', (fazla,))
+
+    def istatistikler(self):
+        with self._kilit:
+            adet = self.conn.execute('SELECT COUNT(*) FROM sonuclar').fetchone()[0]
+            return dict(self.istatistik, kayit=adet, max_kayit=self.max_kayit, ttl_gun=self.ttl_gun)
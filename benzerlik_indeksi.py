@@ -0,0 +1,138 @@
+import json
+import math
+import os
+import threading
+import time
+from collections import defaultdict
+
+def kelimeler(baslik):
+    """Başlığı title_similarity ile aynı şekilde kelime kümesine çevir"""
+    return frozenset((baslik or '').lower().split())
+
+class BaslikIndeksi:
+    """Jaccard benzerliği için önek filtreli ters indeks
+
+    Kelimeler sabit bir sırayla dizilir ve her başlığın sadece ilk
+    |A| - ceil(esik * |A|) + 1 kelimesi indekslenir. Benzerliği eşiği geçen
+    iki başlık bu öneklerde mutlaka ortak bir kelime paylaştığı için sonuç
+    birebir karşılaştırma ile aynıdır, ama her başlık sadece birkaç adayla
+    karşılaştırılır.
+    """
+
+    def __init__(self, esik=0.8, dosya=None, ttl_saat=48, max_kayit=20000):
+        self.esik = esik
+        self.dosya = dosya
+        self.ttl_saat = ttl_saat
+        self.max_kayit = max_kayit
+        self._kilit = threading.RLock()
+        self._kayitlar = {}  # no -> {'kelimeler', 'link', 'zaman'}
+        self._indeks = defaultdict(set)  # kelime -> {no}
+        self._sayac = 0
+
+        if dosya:
+            self._yukle()
+
+    def _onek(self, kume):
+        onek_uzunlugu = len(kume) - math.ceil(self.esik * len(kume) - 1e-9) + 1
+        return sorted(kume)[:onek_uzunlugu]
+
+    def benzer_bul(self, kume, haric_link=None):
+        """Eşiği geçen ilk kaydı döndür (aynı linke sahip kayıtlar hariç)"""
+        if not kume:
+            return None
+
+        with self._kilit:
+            adaylar = set()
+            for kelime in self._onek(kume):
+                adaylar.update(self._indeks.get(kelime, ()))
+
+            for no in adaylar:
+                kayit = self._kayitlar[no]
+                diger = kayit['kelimeler']
+
+                # Boyut filtresi: |küçük| / |büyük| eşiğin altındaysa Jaccard da altındadır
+                if min(len(kume), len(diger)) <= self.esik * max(len(kume), len(diger)) - 1e-9:
+                    continue
+                if haric_link and kayit['link'] == haric_link:
+                    continue
+
+                kesisim = len(kume & diger)
+                if kesisim / (len(kume) + len(diger) - kesisim) > self.esik:
+                    return kayit
+
+        return None
+
+    def ekle(self, kume, link='', zaman=None):
+        if not kume:
+            return
+
+        with self._kilit:
+            self._sayac += 1
+            no = self._sayac
+            self._kayitlar[no] = {'kelimeler': frozenset(kume), 'link': link,
+                                  'zaman': zaman or time.time()}
+            for kelime in self._onek(kume):
+                self._indeks[kelime].add(no)
+
+    def _sil(self, no):
+        kayit = self._kayitlar.pop(no)
+        for kelime in self._onek(kayit['kelimeler']):
+            nolar = self._indeks.get(kelime)
+            if nolar is not None:
+                nolar.discard(no)
+                if not nolar:
+                    del self._indeks[kelime]
+
+    def suresi_dolanlari_sil(self):
+        """TTL'i geçen ve max_kayit üstündeki en eski kayıtları sil"""
+        with self._kilit:
+            sinir = time.time() - self.ttl_saat * 3600
+            for no in [no for no, k in self._kayitlar.items() if k['zaman'] < sinir]:
+                self._sil(no)
+
+            fazla = len(self._kayitlar) - self.max_kayit
+            if fazla > 0:
+                for no in sorted(self._kayitlar)[:fazla]:
+                    self._sil(no)
+
+    def __len__(self):
+        return len(self._kayitlar)
+
+    def _yukle(self):
+        if not os.path.exists(self.dosya):
+            return
+        try:
+            with open(self.dosya, 'r', encoding='utf-8') as f:
+                for kayit in json.load(f):
+                    self.ekle(frozenset(kayit['kelimeler']), kayit.get('link', ''), kayit.get('zaman'))
+            self.suresi_dolanlari_sil()
+        except Exception as e:
+            print(f"❌ Benzerlik geçmişi yüklenemedi: {e}")
+
+    def kaydet(self):
+        """Geçmişi diske yaz (sadece dosya verildiyse)"""
+        if not self.dosya:
+            return
+
+        with self._kilit:
+            self.suresi_dolanlari_sil()
+            veri = [{'kelimeler': sorted(k['kelimeler']), 'link': k['link'], 'zaman': k['zaman']}
+                    for _, k in sorted(self._kayitlar.items())]
+
+        try:
+            gecici = self.dosya + '.tmp'
+            with open(gecici, 'w', encoding='utf-8') as f:
+                json.dump(veri, f, ensure_ascii=False)
+            os.replace(gecici, self.dosya)
+        except Exception as e:
+            print(f"❌ Benzerlik geçmişi yazma hatası: {e}")
+
+_gecmisler = {}
+_gecmis_kilidi = threading.Lock()
+
+def gecmis_al(dosya='benzerlik_gecmisi.json', ttl_saat=48):
+    """Döngüler arası paylaşılan kalıcı başlık indeksini döndür"""
+    with _gecmis_kilidi:
+        if dosya not in _gecmisler:
+            _gecmisler[dosya] = BaslikIndeksi(dosya=dosya, ttl_saat=ttl_saat)
+        return _gecmisler[dosya]
@@ -0,0 +1,115 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+def icerik_hash(haber):
+    """Başlığın normalize edilmiş halinden içerik hash'i üret"""
+    baslik = haber.get('baslik') or haber.get('headline') or ''
+    baslik = re.sub(r'\s+', ' ', baslik).strip().lower()
+    if not baslik:
+        return ''
+    return hashlib.sha1(baslik.encode('utf-8')).hexdigest()
+
+class GorulenHaberDeposu:
+    """Daha önce görülen haberler için SQLite (WAL) deposu
+
+    Link ve içerik hash'i indekslidir; "görüldü mü?" kontrolü, döngü
+    sonuçlarının eklenmesi ve TTL ile temizlik geçmiş büyüdükçe yavaşlamaz.
+    """
+
+    def __init__(self, dosya='gorulen_haberler.db', ttl_gun=30):
+        self.dosya = dosya
+        self.ttl_gun = ttl_gun
+        self._kilit = threading.Lock()
+
+        self.conn = sqlite3.connect(dosya, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS gorulen (
+                link TEXT PRIMARY KEY,
+                icerik_hash TEXT,
+                kaynak TEXT,
+                ilk_gorulme REAL,
+                son_gorulme REAL
+            );
+            CREATE INDEX IF NOT EXISTS gorulen_hash ON gorulen(icerik_hash);
+            CREATE INDEX IF NOT EXISTS gorulen_son ON gorulen(son_gorulme);
+        ''')
+        self.conn.commit()
+
+    def __len__(self):
+        with self._kilit:
+            return self.conn.execute('SELECT COUNT(*) FROM gorulen').fetchone()[0]
+
+    def goruldu_mu(self, haber):
+        """Haber linki veya içerik hash'i daha önce görüldüyse True"""
+        link = haber.get('link') or haber.get('url') or ''
+        hash_degeri = icerik_hash(haber)
+
+        with self._kilit:
+            if link and self.conn.execute(
+                    'SELECT 1 FROM gorulen WHERE link = ?', (link,)).fetchone():
+                return True
+            if hash_degeri and self.conn.execute(
+                    'SELECT 1 FROM gorulen WHERE icerik_hash = ? LIMIT 1', (hash_degeri,)).fetchone():
+                return True
+        return False
+
+    def ekle(self, haberler, kaynak=''):
+        """Döngü sonuçlarını ekle; var olanların son görülme zamanını güncelle"""
+        simdi = time.time()
+        satirlar = []
+        for haber in haberler:
+            link = haber.get('link') or haber.get('url') or ''
+            if link:
+                satirlar.append((link, icerik_hash(haber), kaynak or haber.get('kaynak', ''), simdi, simdi))
+
+        with self._kilit:
+            self.conn.executemany('''
+                INSERT INTO gorulen (link, icerik_hash, kaynak, ilk_gorulme, son_gorulme)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(link) DO UPDATE SET son_gorulme = excluded.son_gorulme
+            ''', satirlar)
+            self.conn.commit()
+
+        return len(satirlar)
+
+    def suresi_dolanlari_sil(self):
+        """TTL süresince tekrar görülmeyen kayıtları sil"""
+        sinir = time.time() - self.ttl_gun * 86400
+        with self._kilit:
+            silinen = self.conn.execute(
+                'DELETE FROM gorulen WHERE son_gorulme < ?', (sinir,)).rowcount
+            self.conn.commit()
+        return silinen
+
+    def json_dan_aktar(self, dosya, kaynak=''):
+        """Eski onceki_*.json geçmiş dosyasını depoya aktar (sadece bir kez)"""
+        if not dosya or not os.path.exists(dosya):
+            return 0
+
+        with self._kilit:
+            self.conn.execute('CREATE TABLE IF NOT EXISTS aktarilan (dosya TEXT PRIMARY KEY)')
+            if self.conn.execute('SELECT 1 FROM aktarilan WHERE dosya = ?', (dosya,)).fetchone():
+                return 0
+
+        try:
+            with open(dosya, 'r', encoding='utf-8') as f:
+                haberler = json.load(f)
+        except Exception as e:
+            print(f"❌ {dosya} aktarılamadı: {e}")
+            return 0
+
+        eklenen = self.ekle(haberler, kaynak)
+
+        with self._kilit:
+            self.conn.execute('INSERT OR IGNORE INTO aktarilan (dosya) VALUES (?)', (dosya,))
+            self.conn.commit()
+
+        print(f"📦 {dosya}: {eklenen} haber depoya aktarıldı")
+        return eklenen
@@ -0,0 +1,178 @@
+import copy
+import hashlib
+import threading
+
+def kararli_id(haber):
+    """Haberin linkinden türetilen, yenilemeler arasında değişmeyen ID"""
+    anahtar = haber.get('link') or haber.get('url') or haber.get('baslik', '')
+    return hashlib.md5(anahtar.encode('utf-8')).hexdigest()[:8]
+
+def _link(haber):
+    return haber.get('link') or haber.get('url') or ''
+
+def _indeks_alanlari(haber):
+    return {'link': _link(haber), 'kaynak': haber.get('kaynak'), 'durum': haber.get('durum')}
+
+# Ana sayfa filtreleri: filtre adı -> (alan, değer)
+FILTRELER = {
+    'Yeni': ('durum', 'Yeni'),
+    'İstanbul': ('kaynak', 'İstanbul'),
+    'Güncel': ('kaynak', 'Güncel'),
+    'Link': ('kaynak', 'Link'),
+}
+
+class _Anlik:
+    """Haber setinin değişmez anlık görüntüsü ve indeksleri"""
+
+    def __init__(self, liste, onceki=None, degisen=None):
+        self.liste = liste
+        self.surum = 0
+
+        if onceki is None:
+            self.id = {}
+            self.link = {}
+            self.kaynak = {}
+            self.durum = {}
+            for haber in liste:
+                self._indeksle(haber)
+        else:
+            # Tek haber eklendi/değişti: sadece etkilenen görünümler yeniden kurulur
+            self.id = dict(onceki.id)
+            self.link = dict(onceki.link)
+            self.kaynak = dict(onceki.kaynak)
+            self.durum = dict(onceki.durum)
+            self._turet(onceki, *degisen)
+
+        self.sayaclar = {'Tümü': len(liste)}
+        for filtre, (alan, deger) in FILTRELER.items():
+            self.sayaclar[filtre] = len(getattr(self, alan).get(deger, ()))
+
+    def _indeksle(self, haber):
+        self.id[haber.get('id')] = haber
+        link = _link(haber)
+        if link:
+            self.link[link] = haber
+        self.kaynak.setdefault(haber.get('kaynak'), []).append(haber)
+        self.durum.setdefault(haber.get('durum'), []).append(haber)
+
+    def _turet(self, onceki, haber, eski_alanlar):
+        if eski_alanlar is None:
+            # Yeni haber listenin sonuna eklendi
+            self.id[haber.get('id')] = haber
+            link = _link(haber)
+            if link:
+                self.link[link] = haber
+            for alan in ('kaynak', 'durum'):
+                gorunum = getattr(self, alan)
+                gorunum[haber.get(alan)] = gorunum.get(haber.get(alan), []) + [haber]
+            return
+
+        eski_link = eski_alanlar.get('link')
+        if eski_link != _link(haber):
+            if self.link.get(eski_link) is haber:
+                del self.link[eski_link]
+            if _link(haber):
+                self.link[_link(haber)] = haber
+
+        for alan in ('kaynak', 'durum'):
+            eski_deger = eski_alanlar.get(alan)
+            if eski_deger == haber.get(alan):
+                continue
+            gorunum = getattr(self, alan)
+            gorunum[eski_deger] = [h for h in gorunum.get(eski_deger, ()) if h is not haber]
+            # Liste sırası korunsun diye yeni değerin görünümü baştan kurulur
+            gorunum[haber.get(alan)] = [h for h in self.liste if h.get(alan) == haber.get(alan)]
+
+    def gorunum(self, filtre):
+        if filtre not in FILTRELER:
+            return self.liste
+        alan, deger = FILTRELER[filtre]
+        return getattr(self, alan).get(deger, [])
+
+class HaberIndeksi:
+    """Bellekteki haberler için ID, link, kaynak ve durum indeksli depo
+
+    Okumalar o anki anlık görüntü üzerinden kilitsiz yapılır; her değişiklik
+    yeni bir anlık görüntü oluşturup tek atamayla yayınlar. Her değişiklik
+    sürüm numarasını artırır; sayfa önbelleği bu numarayı anahtar olarak kullanır.
+    """
+
+    def __init__(self):
+        self._kilit = threading.Lock()
+        self._anlik = _Anlik([])
+
+    def _degistir(self, anlik):
+        # Kilit altında çağrılır
+        anlik.surum = self._anlik.surum + 1
+        self._anlik = anlik
+
+    def yayinla(self, haberler):
+        """Tüm haber setini değiştir"""
+        anlik = _Anlik(list(haberler))
+        with self._kilit:
+            self._degistir(anlik)
+
+    def ekle_veya_guncelle(self, haber):
+        """Aynı ID'li haber varsa güncelle, yoksa sona ekle; listedeki haberi döndür"""
+        with self._kilit:
+            onceki = self._anlik
+            mevcut = onceki.id.get(haber.get('id'))
+            if mevcut is not None:
+                eski_alanlar = _indeks_alanlari(mevcut)
+                mevcut.update(haber)
+                self._degistir(_Anlik(onceki.liste, onceki, (mevcut, eski_alanlar)))
+            else:
+                mevcut = haber
+                self._degistir(_Anlik(onceki.liste + [haber], onceki, (haber, None)))
+        return mevcut
+
+    def alanlari_guncelle(self, haber_id, alanlar):
+        """Haberin alanlarını güncelle; link/kaynak/durum değiştiyse ilgili görünümleri yenile"""
+        with self._kilit:
+            onceki = self._anlik
+            haber = onceki.id.get(haber_id)
+            if haber is None:
+                return None
+            eski_alanlar = _indeks_alanlari(haber)
+            haber.update(alanlar)
+            if eski_alanlar != _indeks_alanlari(haber):
+                self._degistir(_Anlik(onceki.liste, onceki, (haber, eski_alanlar)))
+            else:
+                # İndeksler aynı kalır, sadece sürüm artar
+                self._degistir(copy.copy(onceki))
+        return haber
+
+    def bul(self, haber_id):
+        return self._anlik.id.get(haber_id)
+
+    def link_ile_bul(self, link):
+        return self._anlik.link.get(link)
+
+    def kaynaga_gore(self, kaynak):
+        return self._anlik.kaynak.get(kaynak, [])
+
+    def duruma_gore(self, durum):
+        return self._anlik.durum.get(durum, [])
+
+    def tumu(self):
+        return self._anlik.liste
+
+    def gorunum(self, filtre):
+        """Ana sayfa filtresinin hazır listesi (bilinmeyen filtre: tüm haberler)"""
+        return self._anlik.gorunum(filtre)
+
+    def sayaclar(self):
+        """Filtre başına haber sayıları; her değişiklikte bir kez hesaplanır"""
+        return self._anlik.sayaclar
+
+    def gorunum_ve_sayaclar(self, filtre):
+        """Aynı anlık görüntüden liste, sayaçlar ve sürüm"""
+        anlik = self._anlik
+        return anlik.gorunum(filtre), anlik.sayaclar, anlik.surum
+
+    def surum(self):
+        """Haber seti her değiştiğinde artan sürüm numarası"""
+        return self._anlik.surum
+
+    def __len__(self):
+        return len(self._anlik.liste)
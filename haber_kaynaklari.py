@@ -1,5 +1,4 @@
 import requests
-from bs4 import BeautifulSoup
 import json
 import re
 import time
@@ -7,14 +6,63 @@ from datetime import datetime, timedelta
 import random
 from urllib.parse import urljoin, urlparse
 import threading
+import asyncio
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import hashlib
+import http_istemci
+import http_onbellek
+import html_ayristirici
+import secici_plani
+import benzerlik_indeksi
 
 class NewsScrapingError(Exception):
     pass
 
+# Türkçe büyük/küçük harf dönüşümü: İ -> i, I -> ı (str.lower bunu yanlış yapar)
+_TR_KUCUK_HARF = str.maketrans({'İ': 'i', 'I': 'ı'})
+
+def tr_lower(text):
+    """Türkçe kurallarına göre küçük harfe çevir"""
+    return text.translate(_TR_KUCUK_HARF).lower()
+
+# Eşleştirmede ı/i farkı yok sayılır: ASCII büyük harfli UMRANIYE, ISTANBUL da eşleşir
+_TR_KATLAMA = str.maketrans({'ı': 'i'})
+
+def tr_katla(text):
+    """Anahtar kelime eşleştirmesi için küçük harf + ı/i katlaması"""
+    return tr_lower(text).translate(_TR_KATLAMA)
+
 class MultiNewsSource:
-    def __init__(self):
+    def __init__(self, config=None):
+        self.config = config or {}
+        # Tüm kaynaklar için ortak bağlantı havuzu
+        self.http = http_istemci.varsayilan_istemci(self.config)
+        
+        # Liste sayfaları için koşullu GET önbelleği
+        settings = self.config.get('settings', {})
+        self.html_parser = html_ayristirici.motor_sec(self.config)
+        self.max_items_per_page = settings.get('max_items_per_page', 30)
+        
+        # Akış modu: yeterli liste elemanı sayılınca veya bayt sınırında bağlantıyı kes;
+        # okunan kısım yine tam ayrıştırılır (uzun sayfalarda indirme kısalır)
+        self.streaming_parse = settings.get('streaming_parse', False)
+        self.stream_max_bytes = settings.get('stream_max_bytes', 512 * 1024)
+        
+        # Genel sitelerde kazanan seçiciyi hatırlayan plan
+        self.selector_plan = secici_plani.plan_al(
+            settings.get('selector_plan_file', 'secici_plani.json'))
+        
+        # Önceki döngülerdeki başlıklara karşı da benzerlik kontrolü
+        self.dedupe_history = None
+        if settings.get('dedupe_persist', False):
+            self.dedupe_history = benzerlik_indeksi.gecmis_al(
+                settings.get('dedupe_history_file', 'benzerlik_gecmisi.json'),
+                settings.get('dedupe_history_hours', 48))
+        self.validator_cache = None
+        if settings.get('http_cache_enabled', True):
+            self.validator_cache = http_onbellek.onbellek_al(
+                settings.get('http_cache_file', 'http_onbellek.json'))
+        
         self.user_agents = [
             'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36',
@@ -31,10 +79,20 @@ class MultiNewsSource:
             'avcılar', 'bahçelievler', 'bağcılar', 'esenler', 'gaziosmanpaşa',
             'eyüpsultan', 'kağıthane', 'sarıyer', 'başakşehir', 'büyükçekmece',
             'çekmeköy', 'kartal', 'küçükçekmece', 'sancaktepe', 'silivri',
-            'sultanbeyli', 'tuzla', 'umraniye', 'arnavutköy', 'çatalca',
+            'sultanbeyli', 'tuzla', 'ümraniye', 'arnavutköy', 'çatalca',
             'esenyurt', 'güngören', 'sultangazi'
         ]
         
+        # Tüm anahtar kelimeler için tek seferlik derlenmiş eşleştirici
+        # Anahtar: katlanmış yazım, değer: etiket (ISTANBUL -> 'istanbul')
+        self._istanbul_names = {}
+        for keyword in self.istanbul_keywords:
+            self._istanbul_names.setdefault(tr_katla(keyword), tr_lower(keyword))
+        # Ü'süz ASCII yazım da aynı ilçe
+        self._istanbul_names['umraniye'] = 'ümraniye'
+        self._istanbul_pattern = re.compile('|'.join(
+            re.escape(name) for name in sorted(self._istanbul_names, key=len, reverse=True)))
+        
         # Haber siteleri yapılandırması - GÜNCEL VE ÇALIŞAN URL'LER
         self.news_sources = {
             'sondakika': {
@@ -83,6 +141,13 @@ class MultiNewsSource:
                 'enabled': True
             }
         }
+        
+        # Genel siteler için liste seçicileri (öncelik sırasıyla)
+        self.generic_selectors = [
+            'article', 'div.news-item', 'div.card', 'li.news',
+            '.news-card', '.story', '.post', '.news-list-item',
+            'div[class*="news"]', 'div[class*="haber"]', 'a[href*="/haber"]'
+        ]
 
     def get_random_headers(self):
         """Rastgele User-Agent ve headers döndürür"""
@@ -99,17 +164,21 @@ class MultiNewsSource:
             'Sec-Fetch-Site': 'none'
         }
 
-    def safe_get(self, url, timeout=15, retries=2):
+    def safe_get(self, url, timeout=15, retries=2, extra_headers=None, stream=False):
         """Güvenli HTTP GET isteği - Hızlı ayarlar"""
         for attempt in range(retries):
             try:
-                session = requests.Session()
-                session.headers.update(self.get_random_headers())
+                headers = self.get_random_headers()
+                if extra_headers:
+                    headers.update(extra_headers)
                 
-                response = session.get(url, timeout=timeout, allow_redirects=True)
+                # Paylaşılan havuz sayesinde aynı host'a bağlantı yeniden kullanılır
+                response = self.http.get(url, headers=headers, timeout=timeout,
+                                         allow_redirects=True, stream=stream)
                 response.raise_for_status()
                 
-                if response.status_code == 200:
+                # 304 sadece koşullu isteklerde döner
+                if response.status_code in (200, 304):
                     return response
                     
             except requests.exceptions.RequestException as e:
@@ -189,9 +258,23 @@ class MultiNewsSource:
 
     def is_istanbul_related(self, title, description="", content=""):
         """Haberin İstanbul ile ilgili olup olmadığını kontrol et"""
-        text_to_check = f"{title} {description} {content}".lower()
+        text_to_check = tr_katla(f"{title} {description} {content}")
         
-        return any(keyword.lower() in text_to_check for keyword in self.istanbul_keywords)
+        return self._istanbul_pattern.search(text_to_check) is not None
+
+    def match_istanbul(self, title, description="", content=""):
+        """Metinde geçen İstanbul anahtar kelimelerini tek geçişte bul
+        
+        Eşleşme yoksa boş liste döner; 'istanbul' dışındaki eşleşmeler ilçe/semt etiketidir.
+        """
+        text_to_check = tr_katla(f"{title} {description} {content}")
+        
+        matches = []
+        for match in self._istanbul_pattern.finditer(text_to_check):
+            name = self._istanbul_names[match.group()]
+            if name not in matches:
+                matches.append(name)
+        return matches
 
     def is_today_news(self, date_str, hours_back=24):
         """Haberin bugün veya son X saat içinde olup olmadığını kontrol et"""
@@ -225,66 +308,7 @@ class MultiNewsSource:
         
         for url in urls:
             try:
-                response = self.safe_get(url)
-                if not response:
-                    continue
-                    
-                soup = BeautifulSoup(response.text, 'html.parser')
-                haber_listesi = soup.select('li.nws')
-                
-                for haber in haber_listesi[:30]:  # İlk 30 haber
-                    try:
-                        # Başlık
-                        baslik_elem = haber.select_one('span.title')
-                        if not baslik_elem:
-                            continue
-                        baslik = self.clean_title(baslik_elem.get_text())
-                        
-                        # Link
-                        link_elem = haber.select_one('a.content')
-                        if not link_elem or not link_elem.get('href'):
-                            continue
-                        link = "https://www.sondakika.com" + link_elem['href']
-                        
-                        # İstanbul kontrolü
-                        aciklama_elem = haber.select_one('p.news-detail')
-                        aciklama = self.clean_text(aciklama_elem.get_text()) if aciklama_elem else ""
-                        
-                        if not self.is_istanbul_related(baslik, aciklama):
-                            continue
-                        
-                        # Tarih
-                        tarih_elem = haber.select_one('span.mdate')
-                        tarih = self.format_date(tarih_elem.get_text()) if tarih_elem else ""
-                        
-                        # Güncel haber kontrolü
-                        if not self.is_today_news(tarih):
-                            continue
-                        
-                        # Resim
-                        resim_elem = haber.select_one('img')
-                        resim = ""
-                        if resim_elem:
-                            resim = resim_elem.get('src') or resim_elem.get('data-originalm') or ""
-                            if resim and resim.startswith('/'):
-                                resim = "https://www.sondakika.com" + resim
-                        
-                        haber_data = {
-                            'id': self.generate_news_id(baslik, link),
-                            'baslik': baslik,
-                            'link': link,
-                            'aciklama': aciklama,
-                            'tarih': tarih,
-                            'resim': resim,
-                            'kaynak': 'sondakika',
-                            'site_url': 'www.sondakika.com',
-                            'durum': 'yeni'
-                        }
-                        
-                        haberler.append(haber_data)
-                        
-                    except Exception as e:
-                        continue
+                haberler.extend(self.fetch_listing('sondakika', url))
                         
             except Exception as e:
                 print(f"❌ Sondakika hata: {str(e)[:50]}...")
@@ -292,6 +316,71 @@ class MultiNewsSource:
         print(f"✅ Sondakika: {len(haberler)} haber")
         return haberler
 
+    def parse_sondakika_html(self, html):
+        """Sondakika.com liste sayfası HTML'inden haberleri çıkar"""
+        haberler = []
+        
+        soup = html_ayristirici.ayristir(html, self.html_parser)
+        haber_listesi = soup.select('li.nws')
+        
+        for haber in haber_listesi[:self.max_items_per_page]:  # İlk 30 haber
+            try:
+                # Başlık
+                baslik_elem = haber.select_one('span.title')
+                if not baslik_elem:
+                    continue
+                baslik = self.clean_title(baslik_elem.get_text())
+                
+                # Link
+                link_elem = haber.select_one('a.content')
+                if not link_elem or not link_elem.get('href'):
+                    continue
+                link = "https://www.sondakika.com" + link_elem['href']
+                
+                # İstanbul kontrolü
+                aciklama_elem = haber.select_one('p.news-detail')
+                aciklama = self.clean_text(aciklama_elem.get_text()) if aciklama_elem else ""
+                
+                eslesmeler = self.match_istanbul(baslik, aciklama)
+                if not eslesmeler:
+                    continue
+                
+                # Tarih
+                tarih_elem = haber.select_one('span.mdate')
+                tarih = self.format_date(tarih_elem.get_text()) if tarih_elem else ""
+                
+                # Güncel haber kontrolü
+                if not self.is_today_news(tarih):
+                    continue
+                
+                # Resim
+                resim_elem = haber.select_one('img')
+                resim = ""
+                if resim_elem:
+                    resim = resim_elem.get('src') or resim_elem.get('data-originalm') or ""
+                    if resim and resim.startswith('/'):
+                        resim = "https://www.sondakika.com" + resim
+                
+                haber_data = {
+                    'id': self.generate_news_id(baslik, link),
+                    'baslik': baslik,
+                    'link': link,
+                    'aciklama': aciklama,
+                    'tarih': tarih,
+                    'resim': resim,
+                    'kaynak': 'sondakika',
+                    'site_url': 'www.sondakika.com',
+                    'durum': 'yeni',
+                    'ilceler': [e for e in eslesmeler if e != 'istanbul']
+                }
+                
+                haberler.append(haber_data)
+                
+            except Exception as e:
+                continue
+        
+        return haberler
+
     def scrape_generic_site(self, site_name, urls):
         """Genel site scraper"""
         print(f"📰 {site_name.title()} çekiliyor...")
@@ -299,94 +388,98 @@ class MultiNewsSource:
         
         for url in urls:
             try:
-                response = self.safe_get(url)
-                if not response:
+                haberler.extend(self.fetch_listing(site_name, url))
+                        
+            except Exception as e:
+                print(f"❌ {site_name.title()} hata: {str(e)[:50]}...")
+        
+        print(f"✅ {site_name.title()}: {len(haberler)} haber")
+        return haberler
+
+    def parse_generic_html(self, site_name, html):
+        """Genel site liste sayfası HTML'inden haberleri çıkar"""
+        haberler = []
+        
+        soup = html_ayristirici.ayristir(html, self.html_parser)
+        
+        # Önce geçen döngülerde kazanan seçiciyi dene
+        haber_listesi = []
+        kazanan = None
+        for selector in self.listing_selectors(site_name):
+            haber_listesi = soup.select(selector)
+            if len(haber_listesi) > 5:  # En az 5 element olsun
+                kazanan = selector
+                break
+        
+        self.selector_plan.sonuc_kaydet(site_name, kazanan)
+        
+        base_url = self.news_sources[site_name]['base_url']
+        
+        for haber in haber_listesi[:self.max_items_per_page]:  # İlk 30 element
+            try:
+                if haber.name == 'a':
+                    link_elem = haber
+                    baslik = self.clean_title(haber.get_text())
+                else:
+                    link_elem = haber.select_one('a')
+                    if not link_elem:
+                        continue
+                    baslik_elem = haber.select_one('h1, h2, h3, h4, .title, .headline, .baslik')
+                    baslik = self.clean_title(baslik_elem.get_text()) if baslik_elem else self.clean_title(link_elem.get_text())
+                
+                if not baslik or len(baslik) < 10:
+                    continue
+                
+                link = link_elem.get('href', '')
+                if not link:
                     continue
                     
-                soup = BeautifulSoup(response.text, 'html.parser')
+                if link.startswith('/'):
+                    link = base_url + link
+                elif not link.startswith('http'):
+                    continue
                 
-                # Genel selector'lar
-                selectors = [
-                    'article', 'div.news-item', 'div.card', 'li.news',
-                    '.news-card', '.story', '.post', '.news-list-item',
-                    'div[class*="news"]', 'div[class*="haber"]', 'a[href*="/haber"]'
-                ]
+                # İstanbul kontrolü
+                aciklama_elem = haber.select_one('.summary, .excerpt, .description, p, .spot')
+                aciklama = self.clean_text(aciklama_elem.get_text()) if aciklama_elem else ""
                 
-                haber_listesi = []
-                for selector in selectors:
-                    haber_listesi = soup.select(selector)
-                    if len(haber_listesi) > 5:  # En az 5 element olsun
-                        break
+                eslesmeler = self.match_istanbul(baslik, aciklama)
+                if not eslesmeler:
+                    continue
                 
-                base_url = self.news_sources[site_name]['base_url']
+                # Tarih
+                tarih_elem = haber.select_one('.date, .time, time, .tarih, .zaman')
+                tarih = self.format_date(tarih_elem.get_text()) if tarih_elem else ""
+                
+                if not self.is_today_news(tarih):
+                    continue
+                
+                # Resim
+                resim_elem = haber.select_one('img')
+                resim = ""
+                if resim_elem:
+                    resim = resim_elem.get('src') or resim_elem.get('data-src') or resim_elem.get('data-lazy-src') or ""
+                    if resim and resim.startswith('/'):
+                        resim = base_url + resim
+                
+                haber_data = {
+                    'id': self.generate_news_id(baslik, link),
+                    'baslik': baslik,
+                    'link': link,
+                    'aciklama': aciklama,
+                    'tarih': tarih,
+                    'resim': resim,
+                    'kaynak': site_name,
+                    'site_url': urlparse(base_url).netloc,
+                    'durum': 'yeni',
+                    'ilceler': [e for e in eslesmeler if e != 'istanbul']
+                }
+                
+                haberler.append(haber_data)
                 
-                for haber in haber_listesi[:30]:  # İlk 30 element
-                    try:
-                        if haber.name == 'a':
-                            link_elem = haber
-                            baslik = self.clean_title(haber.get_text())
-                        else:
-                            link_elem = haber.select_one('a')
-                            if not link_elem:
-                                continue
-                            baslik_elem = haber.select_one('h1, h2, h3, h4, .title, .headline, .baslik')
-                            baslik = self.clean_title(baslik_elem.get_text()) if baslik_elem else self.clean_title(link_elem.get_text())
-                        
-                        if not baslik or len(baslik) < 10:
-                            continue
-                        
-                        link = link_elem.get('href', '')
-                        if not link:
-                            continue
-                            
-                        if link.startswith('/'):
-                            link = base_url + link
-                        elif not link.startswith('http'):
-                            continue
-                        
-                        # İstanbul kontrolü
-                        aciklama_elem = haber.select_one('.summary, .excerpt, .description, p, .spot')
-                        aciklama = self.clean_text(aciklama_elem.get_text()) if aciklama_elem else ""
-                        
-                        if not self.is_istanbul_related(baslik, aciklama):
-                            continue
-                        
-                        # Tarih
-                        tarih_elem = haber.select_one('.date, .time, time, .tarih, .zaman')
-                        tarih = self.format_date(tarih_elem.get_text()) if tarih_elem else ""
-                        
-                        if not self.is_today_news(tarih):
-                            continue
-                        
-                        # Resim
-                        resim_elem = haber.select_one('img')
-                        resim = ""
-                        if resim_elem:
-                            resim = resim_elem.get('src') or resim_elem.get('data-src') or resim_elem.get('data-lazy-src') or ""
-                            if resim and resim.startswith('/'):
-                                resim = base_url + resim
-                        
-                        haber_data = {
-                            'id': self.generate_news_id(baslik, link),
-                            'baslik': baslik,
-                            'link': link,
-                            'aciklama': aciklama,
-                            'tarih': tarih,
-                            'resim': resim,
-                            'kaynak': site_name,
-                            'site_url': urlparse(base_url).netloc,
-                            'durum': 'yeni'
-                        }
-                        
-                        haberler.append(haber_data)
-                        
-                    except Exception as e:
-                        continue
-                        
             except Exception as e:
-                print(f"❌ {site_name.title()} hata: {str(e)[:50]}...")
+                continue
         
-        print(f"✅ {site_name.title()}: {len(haberler)} haber")
         return haberler
 
     def scrape_sozcu(self, urls):
@@ -403,10 +496,7 @@ class MultiNewsSource:
             return []
         
         try:
-            urls = []
-            for key, value in source_config.items():
-                if key.endswith('_url') and value:
-                    urls.append(value)
+            urls = self.get_source_urls(source_config)
             
             if not urls:
                 return []
@@ -428,26 +518,103 @@ class MultiNewsSource:
             print(f"❌ {source_name} genel hatası: {str(e)[:50]}...")
             return []
 
+    def get_source_urls(self, source_config):
+        """Kaynak yapılandırmasındaki liste sayfası URL'lerini döndür"""
+        return [value for key, value in source_config.items()
+                if key.endswith('_url') and value]
+
+    def fetch_listing(self, source_name, url):
+        """Liste sayfasını çek ve ayrıştır - değişmemiş sayfalar için önbelleği kullan"""
+        cache = self.validator_cache
+        extra_headers = cache.kosullu_basliklar(url) if cache else None
+        
+        response = self.safe_get(url, extra_headers=extra_headers, stream=self.streaming_parse)
+        if not response:
+            return []
+        
+        if response.status_code == 304:
+            body = b''
+        elif self.streaming_parse:
+            body = self.read_listing_stream(source_name, response)
+        else:
+            body = response.content
+        
+        if cache:
+            onceki = cache.degismemis_haberler(url, response.status_code, body)
+            if onceki is not None:
+                return onceki
+        
+        if response.status_code == 304:
+            return []  # Önbellek kaydı yoksa gövde de yok
+        
+        if self.streaming_parse:
+            html = body.decode(response.encoding or 'utf-8', errors='replace')
+        else:
+            html = response.text
+        haberler = self.parse_source_html(source_name, html)
+        
+        if cache:
+            cache.guncelle(url, response.headers, body, haberler)
+        
+        return haberler
+
+    def listing_selectors(self, source_name):
+        """Kaynağın liste elemanı seçicilerini döndür"""
+        if source_name == 'sondakika':
+            return ['li.nws']
+        return self.selector_plan.sirali_seciciler(source_name, self.generic_selectors)
+
+    def read_listing_stream(self, source_name, response):
+        """Liste sayfasını yeterli sayıda eleman sayılana kadar oku (ayrıştırma sonra yapılır)"""
+        cap = self.max_items_per_page
+        
+        def yeterli_mi(sayaclar):
+            # parse_generic_html'deki gibi 5'ten fazla eleman bulan ilk seçici kazanır
+            for sayac in sayaclar:
+                if sayac > 5 or len(sayaclar) == 1:
+                    return sayac >= cap
+            return False
+        
+        return html_ayristirici.akista_oku(response, self.listing_selectors(source_name),
+                                          yeterli_mi, self.stream_max_bytes)
+
+    def parse_source_html(self, source_name, html):
+        """Kaynağa uygun parser ile liste sayfasını ayrıştır"""
+        if source_name == 'sondakika':
+            return self.parse_sondakika_html(html)
+        return self.parse_generic_html(source_name, html)
+
     def remove_duplicates(self, haberler):
         """Dublicate haberleri kaldır"""
         seen_ids = set()
-        seen_titles = set()
+        # title_similarity > 0.8 ile aynı sonuç, ama her başlık sadece aday başlıklarla karşılaştırılır
+        seen_titles = benzerlik_indeksi.BaslikIndeksi(esik=0.8)
         unique_haberler = []
         
         for haber in haberler:
             haber_id = haber.get('id', '')
-            baslik = haber.get('baslik', '').lower().strip()
+            link = haber.get('link', '')
+            kelimeler = benzerlik_indeksi.kelimeler(haber.get('baslik', ''))
             
             # ID veya benzer başlık kontrolü
-            title_similarity = any(
-                self.title_similarity(baslik, seen_title) > 0.8 
-                for seen_title in seen_titles
-            )
+            if haber_id in seen_ids or seen_titles.benzer_bul(kelimeler):
+                continue
+            
+            # Aynı haber tekrar çekildiyse kendisiyle eşleşmesin diye link hariç tutulur
+            if self.dedupe_history and self.dedupe_history.benzer_bul(kelimeler, haric_link=link):
+                continue
             
-            if haber_id not in seen_ids and not title_similarity:
-                seen_ids.add(haber_id)
-                seen_titles.add(baslik)
-                unique_haberler.append(haber)
+            seen_ids.add(haber_id)
+            seen_titles.ekle(kelimeler, link)
+            unique_haberler.append(haber)
+        
+        if self.dedupe_history:
+            for haber in unique_haberler:
+                link = haber.get('link', '')
+                kelimeler = benzerlik_indeksi.kelimeler(haber.get('baslik', ''))
+                if not self.dedupe_history.benzer_bul(kelimeler):
+                    self.dedupe_history.ekle(kelimeler, link)
+            self.dedupe_history.kaydet()
         
         return unique_haberler
 
@@ -477,7 +644,8 @@ class MultiNewsSource:
                 'sondakika': 10, 'sozcu': 9, 'hurriyet': 8, 'milliyet': 7,
                 'cnnturk': 6, 'ntv': 5, 'haberturk': 4, 'cumhuriyet': 3
             }
-            score += source_priority.get(haber.get('kaynak', ''), 1)
+            # Birleştirilmiş listelerde 'kaynak' kategoriye dönüşmüş olabilir, site adı 'site'de
+            score += source_priority.get(haber.get('site') or haber.get('kaynak', ''), 1)
             
             # Tarih önceliği (yeni haberler)
             try:
@@ -504,7 +672,12 @@ class MultiNewsSource:
         
         return sorted(haberler, key=priority_score, reverse=True)
 
-    def scrape_all_sources(self, max_workers=3):
+    def get_active_sources(self, sources=None):
+        """Etkin kaynak adlarını döndür; sources verilirse sadece onlarla sınırla"""
+        return [name for name, config in self.news_sources.items()
+                if config.get('enabled', False) and (sources is None or name in sources)]
+
+    def scrape_all_sources(self, max_workers=3, sources=None):
         """Tüm haber kaynaklarından haberleri çek - Konservatif ayarlar"""
         print("🌍 Tüm haber kaynakları çekiliyor...")
         start_time = time.time()
@@ -512,15 +685,13 @@ class MultiNewsSource:
         all_haberler = []
         
         # Önce aktif siteleri kontrol et
-        active_sources = [name for name, config in self.news_sources.items() 
-                         if config.get('enabled', False)]
+        active_sources = self.get_active_sources(sources)
         print(f"📊 Aktif siteler: {', '.join(active_sources)}")
         
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
             future_to_source = {
-                executor.submit(self.scrape_single_source, name, config): name
-                for name, config in self.news_sources.items()
-                if config.get('enabled', False)
+                executor.submit(self.scrape_single_source, name, self.news_sources[name]): name
+                for name in active_sources
             }
             
             for future in as_completed(future_to_source):
@@ -535,6 +706,67 @@ class MultiNewsSource:
                 except Exception as e:
                     print(f"❌ {source_name} thread hatası: {str(e)[:50]}...")
         
+        return self.finalize_results(all_haberler, start_time)
+
+    def scrape_all_sources_async(self, global_limit=None, per_host_limit=None, sources=None):
+        """Tüm kaynakların tüm liste sayfalarını aynı anda çek (asyncio motoru)
+        
+        İstekler paylaşılan HTTP havuzu üzerinden thread'lerde çalışır; asyncio
+        sadece eşzamanlılığı yönetir. Host başına ve toplamda limit uygulanır.
+        """
+        print("🌍 Tüm haber kaynakları çekiliyor (async motor)...")
+        start_time = time.time()
+        
+        settings = self.config.get('settings', {})
+        global_limit = global_limit or settings.get('async_global_limit', 16)
+        per_host_limit = per_host_limit or settings.get('async_per_host_limit', 2)
+        
+        active_sources = self.get_active_sources(sources)
+        print(f"📊 Aktif siteler: {', '.join(active_sources)}")
+        
+        isler = [(name, url)
+                 for name in active_sources
+                 for url in self.get_source_urls(self.news_sources[name])]
+        
+        sonuclar = asyncio.run(self._fetch_all_async(isler, global_limit, per_host_limit))
+        
+        all_haberler = []
+        source_count = {}
+        for source_name, haberler in sonuclar:
+            all_haberler.extend(haberler)
+            source_count[source_name] = source_count.get(source_name, 0) + len(haberler)
+        
+        for source_name in active_sources:
+            if source_count.get(source_name):
+                print(f"✅ {source_name}: {source_count[source_name]} haber eklendi")
+            else:
+                print(f"⚠️ {source_name}: Haber bulunamadı")
+        
+        return self.finalize_results(all_haberler, start_time)
+
+    async def _fetch_all_async(self, isler, global_limit, per_host_limit):
+        """(kaynak, url) çiftlerini eşzamanlı çek ve ayrıştır"""
+        loop = asyncio.get_running_loop()
+        global_sem = asyncio.Semaphore(global_limit)
+        host_sems = {}
+        
+        async def fetch_one(source_name, url):
+            host = urlparse(url).netloc
+            host_sem = host_sems.setdefault(host, asyncio.Semaphore(per_host_limit))
+            try:
+                async with host_sem, global_sem:
+                    haberler = await loop.run_in_executor(
+                        executor, self.fetch_listing, source_name, url)
+                    return source_name, haberler
+            except Exception as e:
+                print(f"❌ {source_name} async hatası: {str(e)[:50]}...")
+                return source_name, []
+        
+        with ThreadPoolExecutor(max_workers=global_limit) as executor:
+            return await asyncio.gather(*(fetch_one(name, url) for name, url in isler))
+
+    def finalize_results(self, all_haberler, start_time):
+        """Dublicate temizleme, sıralama ve özet loglama"""
         # Dublicate'leri kaldır
         original_count = len(all_haberler)
         all_haberler = self.remove_duplicates(all_haberler)
@@ -549,6 +781,21 @@ class MultiNewsSource:
         print(f"🔄 {removed_count} dublicate kaldırıldı")
         print(f"🎯 Toplam: {len(all_haberler)} benzersiz İstanbul haberi")
         
+        havuz = self.http.istatistikler()
+        print(f"🔌 Bağlantı havuzu: {havuz['hit']} hit / {havuz['miss']} miss")
+        
+        if self.validator_cache:
+            ist = self.validator_cache.istatistik
+            print(f"🗂️  Koşullu GET: {ist['304']} x 304, {ist['ayni_hash']} aynı gövde, {ist['degisti']} değişti")
+        
+        # Sayaçlar sayfa başına değil döngü başına bir kez yazılır
+        self.selector_plan.kaydet()
+        for site, plan in self.selector_plan.istatistikler().items():
+            print(f"🎯 {site}: {plan['kazanan']} (isabet %{plan['isabet_orani'] * 100:.0f})")
+        
+        for motor, ist in html_ayristirici.istatistikler().items():
+            print(f"🧩 {motor}: {ist['adet']} sayfa, ort. {ist['ortalama_ms']} ms ({ist['kb']} KB)")
+        
         # Kaynak dağılımı
         source_count = {}
         for haber in all_haberler:
@@ -562,11 +809,14 @@ class MultiNewsSource:
         
         return all_haberler
 
-    def get_fresh_istanbul_news(self, hours_back=6, max_news=100):
+    def get_fresh_istanbul_news(self, hours_back=6, max_news=100, sources=None):
         """Son X saat içindeki taze İstanbul haberlerini getir"""
         print(f"🔥 Son {hours_back} saat içindeki taze İstanbul haberleri alınıyor...")
         
-        all_news = self.scrape_all_sources()
+        if self.config.get('settings', {}).get('scrape_engine', 'thread') == 'async':
+            all_news = self.scrape_all_sources_async(sources=sources)
+        else:
+            all_news = self.scrape_all_sources(sources=sources)
         
         # Tarih filtresi uygula
         fresh_news = []
@@ -581,16 +831,23 @@ class MultiNewsSource:
         return fresh_news
 
 # ESKİ SİSTEMLE UYUMLULUK FONKSİYONLARI
-def sirali_haber_kontrol(config, onceki_istanbul_haberler=None, onceki_guncel_haberler=None):
-    """Eski sistemle uyumlu sıralı haber kontrolü"""
+def sirali_haber_kontrol(config, onceki_istanbul_haberler=None, onceki_guncel_haberler=None, depo=None,
+                         kaynaklar=None):
+    """Eski sistemle uyumlu sıralı haber kontrolü
+    
+    depo (haber_deposu.GorulenHaberDeposu) verilirse önceki haber listeleri yerine
+    kalıcı depo sorgulanır ve bu döngünün haberleri depoya eklenir. kaynaklar
+    verilirse sadece o siteler çekilir.
+    """
     print("🔍 Sıralı haber kontrolü başlıyor (Yeni Çoklu Site Sistemi)...")
     
-    scraper = MultiNewsSource()
+    scraper = MultiNewsSource(config)
     
     # Taze İstanbul haberlerini çek
     yeni_haberler = scraper.get_fresh_istanbul_news(
         hours_back=config.get('settings', {}).get('hours_back', 12),
-        max_news=config.get('settings', {}).get('max_news', 100)
+        max_news=config.get('settings', {}).get('max_news', 100),
+        sources=kaynaklar
     )
     
     # Önceki haberlerin linklerini çıkar
@@ -600,22 +857,28 @@ def sirali_haber_kontrol(config, onceki_istanbul_haberler=None, onceki_guncel_ha
     if onceki_guncel_haberler:
         onceki_linkler.update(h.get('link', '') for h in onceki_guncel_haberler)
     
+    def daha_once_goruldu(haber):
+        if depo is not None:
+            return depo.goruldu_mu(haber)
+        return haber['link'] in onceki_linkler
+    
     # Yeni haberleri tespit et
     gercekten_yeni = []
     for haber in yeni_haberler:
-        if haber.get('link') and haber['link'] not in onceki_linkler:
+        if haber.get('link') and not daha_once_goruldu(haber):
             haber['durum'] = 'yeni'
             gercekten_yeni.append(haber)
         else:
             haber['durum'] = 'eski'
     
+    # Bir sonraki döngüde "görüldü" sayılsınlar
+    if depo is not None:
+        depo.ekle(yeni_haberler)
+    
     # Sonuçları logla
     if gercekten_yeni:
         print(f"🔥 {len(gercekten_yeni)} yeni haber bulundu!")
-        # Tüm İstanbul haberlerini güncelle
-        for haber in yeni_haberler:
-            if haber not in gercekten_yeni:
-                haber['durum'] = 'eski'
+        # Yeni olmayanlar yukarıdaki döngüde zaten 'eski' işaretlendi
         return yeni_haberler, [], gercekten_yeni, 'multi'
     else:
         print("📰 Yeni haber bulunamadı")
@@ -625,7 +888,7 @@ def tum_haberler_cek(config):
     """Eski sistemle uyumlu tüm haber çekme"""
     print("🌍 Tüm haber kaynakları çekiliyor (Yeni Çoklu Site Sistemi)...")
     
-    scraper = MultiNewsSource()
+    scraper = MultiNewsSource(config)
     
     # Ayarları config'den al
     hours_back = config.get('settings', {}).get('hours_back', 12)
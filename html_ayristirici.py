@@ -0,0 +1,185 @@
+import re
+import threading
+import time
+from bs4 import BeautifulSoup
+
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as SelectolaxParser
+except ImportError:
+    try:
+        from selectolax.parser import HTMLParser as SelectolaxParser
+    except ImportError:
+        SelectolaxParser = None
+
+# Desteklenen motorlar - selectolax sadece liste sayfası ayrıştırmada kullanılır
+MOTORLAR = ('html.parser', 'lxml', 'selectolax')
+VARSAYILAN_MOTOR = 'html.parser'
+
+# Motor bazında ayrıştırma süreleri: motor -> {'adet': .., 'sure': .., 'bayt': ..}
+_sure_istatistikleri = {}
+_istatistik_kilidi = threading.Lock()
+
+class SelectolaxDugum:
+    """selectolax düğümünü scraper'ın kullandığı BeautifulSoup API alt kümesine uyarlar"""
+
+    def __init__(self, node):
+        self._node = node
+
+    @property
+    def name(self):
+        return self._node.tag
+
+    def select(self, selector):
+        return [SelectolaxDugum(n) for n in self._node.css(selector)]
+
+    def select_one(self, selector):
+        node = self._node.css_first(selector)
+        return SelectolaxDugum(node) if node is not None else None
+
+    def get_text(self, separator='', strip=False):
+        return self._node.text(separator=separator, strip=strip)
+
+    def get(self, key, default=None):
+        value = self._node.attributes.get(key)
+        return default if value is None else value
+
+    def __getitem__(self, key):
+        value = self._node.attributes.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+def motor_sec(config):
+    """config['settings']['html_parser'] değerinden motor adını döndür"""
+    motor = (config or {}).get('settings', {}).get('html_parser', VARSAYILAN_MOTOR)
+    if motor not in MOTORLAR:
+        print(f"⚠️ Bilinmeyen HTML motoru: {motor}, {VARSAYILAN_MOTOR} kullanılıyor")
+        motor = VARSAYILAN_MOTOR
+    return motor
+
+def _sure_kaydet(motor, baslangic, html):
+    sure = time.perf_counter() - baslangic
+    with _istatistik_kilidi:
+        kayit = _sure_istatistikleri.setdefault(motor, {'adet': 0, 'sure': 0.0, 'bayt': 0})
+        kayit['adet'] += 1
+        kayit['sure'] += sure
+        kayit['bayt'] += len(html)
+
+def _soup_olustur(html, motor, **kwargs):
+    baslangic = time.perf_counter()
+    soup = BeautifulSoup(html, motor, **kwargs)
+    _sure_kaydet(motor, baslangic, html)
+    return soup
+
+def ayristir(html, motor=None, tam_api=False, **kwargs):
+    """HTML'i seçili motorla ayrıştır
+
+    tam_api=True ise her zaman BeautifulSoup döner (find_all, decompose vb. gereken
+    link çekiciler için); selectolax seçiliyse lxml ile devam edilir. Hızlı motor
+    sayfayı reddederse veya boş ağaç üretirse html.parser'a düşülür.
+    """
+    motor = motor or VARSAYILAN_MOTOR
+
+    if motor == 'selectolax':
+        if tam_api or SelectolaxParser is None:
+            motor = 'lxml'
+        else:
+            try:
+                baslangic = time.perf_counter()
+                tree = SelectolaxParser(html)
+                _sure_kaydet('selectolax', baslangic, html)
+                if tree.body is not None:
+                    return SelectolaxDugum(tree.root)
+            except Exception as e:
+                print(f"⚠️ selectolax ayrıştıramadı, yedek motora geçiliyor: {str(e)[:50]}")
+            motor = 'html.parser'
+
+    if motor != 'html.parser':
+        try:
+            soup = _soup_olustur(html, motor, **kwargs)
+            if soup.find(True) is not None:
+                return soup
+        except Exception as e:
+            print(f"⚠️ {motor} ayrıştıramadı, html.parser kullanılıyor: {str(e)[:50]}")
+
+    return _soup_olustur(html, 'html.parser', **kwargs)
+
+# tag.sinif veya tag[attr*="deger"] biçimindeki basit seçiciler
+_BASIT_SECICI = re.compile(r'^([a-z0-9]*)(?:\.([\w-]+))?(?:\[([\w-]+)\*="([^"]+)"\])?$')
+
+def basit_secici_eslestirici(selector):
+    """Basit CSS seçicisini lxml elementi üzerinde çalışan bir fonksiyona çevir
+
+    Desteklenmeyen (karmaşık) seçiciler için None döner.
+    """
+    m = _BASIT_SECICI.match(selector.strip())
+    if not m or not any(m.groups()):
+        return None
+    tag, sinif, attr, deger = m.groups()
+
+    def eslesir(elem):
+        if tag and elem.tag != tag:
+            return False
+        if sinif and sinif not in (elem.get('class') or '').split():
+            return False
+        if attr and deger not in (elem.get(attr) or ''):
+            return False
+        return True
+
+    return eslesir
+
+def akista_oku(response, seciciler, yeterli_mi, max_bayt, parca_boyutu=16384):
+    """Yanıtı parça parça oku; yeterli eleman görülünce okumayı kes
+
+    Haber çıkarılmaz: lxml pull parser sadece seçicilere uyan elementleri
+    sayar, okunan ön ek (bytes) sonra normal ayrıştırıcıyla yeniden
+    ayrıştırılır. Kazanç, sayfanın geri kalanının indirilmemesi ve
+    ayrıştırılmamasıdır; ön ek iki kez ayrıştırılır. lxml yoksa sadece
+    max_bayt sınırı uygulanır. Eksik HTML ayrıştırıcılar tarafından tamamlanır.
+    """
+    eslestiriciler = [basit_secici_eslestirici(s) for s in seciciler]
+    sayaclar = [0] * len(seciciler)
+    parser = etree.HTMLPullParser(events=('end',)) if etree is not None else None
+
+    parcalar = []
+    okunan = 0
+    try:
+        for parca in response.iter_content(chunk_size=parca_boyutu):
+            parcalar.append(parca)
+            okunan += len(parca)
+
+            if parser is not None:
+                parser.feed(parca)
+                for _, elem in parser.read_events():
+                    for i, eslesir in enumerate(eslestiriciler):
+                        if eslesir and eslesir(elem):
+                            sayaclar[i] += 1
+                    elem.clear()  # Sayıldıktan sonra ağacı küçük tut
+
+                if yeterli_mi(sayaclar):
+                    break
+
+            if okunan >= max_bayt:
+                break
+    finally:
+        response.close()
+
+    return b''.join(parcalar)
+
+def istatistikler():
+    """Motor bazında ayrıştırma sayısı, toplam ve ortalama süre (ms)"""
+    with _istatistik_kilidi:
+        return {
+            motor: {
+                'adet': kayit['adet'],
+                'toplam_ms': round(kayit['sure'] * 1000, 1),
+                'ortalama_ms': round(kayit['sure'] * 1000 / kayit['adet'], 2) if kayit['adet'] else 0,
+                'kb': round(kayit['bayt'] / 1024, 1)
+            }
+            for motor, kayit in _sure_istatistikleri.items()
+        }
@@ -0,0 +1,112 @@
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+# Havuz istatistikleri: host -> {'hit': .., 'miss': ..}
+_havuz_istatistikleri = {}
+_istatistik_kilidi = threading.Lock()
+
+def _istatistik_kaydet(host, alan):
+    with _istatistik_kilidi:
+        kayit = _havuz_istatistikleri.setdefault(host, {'hit': 0, 'miss': 0})
+        kayit[alan] += 1
+
+class _SayanHavuzMixin:
+    """Bağlantı havuzundan alınan bağlantıları hit/miss olarak sayar"""
+
+    def _get_conn(self, timeout=None):
+        conn = super()._get_conn(timeout=timeout)
+        # _new_conn çağrılmadıysa bağlantı havuzdan geldi demektir
+        if getattr(conn, '_havuzdan_yeni', False):
+            conn._havuzdan_yeni = False
+            _istatistik_kaydet(self.host, 'miss')
+        else:
+            _istatistik_kaydet(self.host, 'hit')
+        return conn
+
+    def _new_conn(self):
+        conn = super()._new_conn()
+        conn._havuzdan_yeni = True
+        return conn
+
+class SayanHTTPConnectionPool(_SayanHavuzMixin, HTTPConnectionPool):
+    pass
+
+class SayanHTTPSConnectionPool(_SayanHavuzMixin, HTTPSConnectionPool):
+    pass
+
+class SayanHTTPAdapter(HTTPAdapter):
+    """Host başına bağlantı havuzu kullanan ve yeniden kullanımı sayan adapter"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': SayanHTTPConnectionPool,
+            'https': SayanHTTPSConnectionPool
+        }
+
+class HttpIstemci:
+    """Scraper, link çekici, resim indirici ve WordPress için ortak HTTP istemcisi
+
+    Tek bir requests.Session paylaşılır; header'lar her istekte ayrıca verildiği
+    için oturum durumu değiştirilmez ve thread'ler arasında güvenle kullanılır.
+    """
+
+    def __init__(self, pool_connections=20, pool_maxsize=10):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+
+        self.session = requests.Session()
+        adapter = SayanHTTPAdapter(pool_connections=pool_connections,
+                                   pool_maxsize=pool_maxsize)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def request(self, method, url, **kwargs):
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url, **kwargs):
+        kwargs.setdefault('allow_redirects', True)
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def istatistikler(self):
+        """Host bazında havuz hit/miss sayılarını döndür"""
+        with _istatistik_kilidi:
+            hostlar = {host: dict(kayit) for host, kayit in _havuz_istatistikleri.items()}
+
+        toplam_hit = sum(k['hit'] for k in hostlar.values())
+        toplam_miss = sum(k['miss'] for k in hostlar.values())
+        toplam = toplam_hit + toplam_miss
+
+        return {
+            'hit': toplam_hit,
+            'miss': toplam_miss,
+            'hit_orani': round(toplam_hit / toplam, 3) if toplam else 0,
+            'hostlar': hostlar
+        }
+
+_varsayilan_istemci = None
+_istemci_kilidi = threading.Lock()
+
+def varsayilan_istemci(config=None):
+    """Süreç genelinde paylaşılan HTTP istemcisini döndür
+
+    İlk çağrıda config['settings']['http'] altındaki pool_connections ve
+    pool_maxsize ayarları kullanılır.
+    """
+    global _varsayilan_istemci
+
+    if _varsayilan_istemci is None:
+        with _istemci_kilidi:
+            if _varsayilan_istemci is None:
+                http_ayarlari = (config or {}).get('settings', {}).get('http', {})
+                _varsayilan_istemci = HttpIstemci(
+                    pool_connections=http_ayarlari.get('pool_connections', 20),
+                    pool_maxsize=http_ayarlari.get('pool_maxsize', 10)
+                )
+
+    return _varsayilan_istemci
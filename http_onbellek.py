@@ -0,0 +1,97 @@
+import copy
+import json
+import os
+import threading
+import hashlib
+from datetime import datetime
+
+class KosulluIstekOnbellegi:
+    """Liste sayfaları için diskte tutulan ETag / Last-Modified önbelleği
+
+    Her URL için doğrulayıcılar, gövde hash'i ve son ayrıştırılan haberler
+    saklanır. Sayfa değişmediyse (304 veya aynı hash) ayrıştırma atlanır.
+    Haberler kopyalanarak saklanır ve döndürülür; yayınlanmış haber dict'leri
+    önbellekle paylaşılmaz.
+    """
+
+    def __init__(self, dosya='http_onbellek.json'):
+        self.dosya = dosya
+        self._kilit = threading.Lock()
+        self.kayitlar = self._yukle()
+        self.istatistik = {'304': 0, 'ayni_hash': 0, 'degisti': 0}
+
+    def _yukle(self):
+        if os.path.exists(self.dosya):
+            try:
+                with open(self.dosya, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except:
+                return {}
+        return {}
+
+    def _diske_yaz(self):
+        gecici = self.dosya + '.tmp'
+        with open(gecici, 'w', encoding='utf-8') as f:
+            json.dump(self.kayitlar, f, ensure_ascii=False)
+        os.replace(gecici, self.dosya)
+
+    @staticmethod
+    def govde_hash(icerik):
+        return hashlib.sha1(icerik).hexdigest()
+
+    def kosullu_basliklar(self, url):
+        """Önbellekteki doğrulayıcılardan If-None-Match / If-Modified-Since üret"""
+        with self._kilit:
+            kayit = self.kayitlar.get(url)
+
+        basliklar = {}
+        if kayit:
+            if kayit.get('etag'):
+                basliklar['If-None-Match'] = kayit['etag']
+            if kayit.get('last_modified'):
+                basliklar['If-Modified-Since'] = kayit['last_modified']
+        return basliklar
+
+    def degismemis_haberler(self, url, status_code, govde):
+        """Sayfa değişmediyse önceki haberleri, değiştiyse None döndür"""
+        with self._kilit:
+            kayit = self.kayitlar.get(url)
+            if not kayit:
+                return None
+
+            if status_code == 304:
+                self.istatistik['304'] += 1
+                return copy.deepcopy(kayit.get('haberler', []))
+
+            if kayit.get('hash') == self.govde_hash(govde):
+                self.istatistik['ayni_hash'] += 1
+                return copy.deepcopy(kayit.get('haberler', []))
+
+        return None
+
+    def guncelle(self, url, headers, govde, haberler):
+        """Yeni doğrulayıcıları ve ayrıştırılan haberleri kaydet"""
+        with self._kilit:
+            self.istatistik['degisti'] += 1
+            self.kayitlar[url] = {
+                'etag': headers.get('ETag', ''),
+                'last_modified': headers.get('Last-Modified', ''),
+                'hash': self.govde_hash(govde),
+                # Çağıran listeyi sonradan değiştirebilir (id, durum, ai_taslak...)
+                'haberler': copy.deepcopy(haberler),
+                'guncelleme': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            }
+            try:
+                self._diske_yaz()
+            except Exception as e:
+                print(f"❌ HTTP önbellek yazma hatası: {e}")
+
+_onbellekler = {}
+_onbellek_kilidi = threading.Lock()
+
+def onbellek_al(dosya='http_onbellek.json'):
+    """Dosya başına tek önbellek örneği döndür (scraper örnekleri arasında paylaşılır)"""
+    with _onbellek_kilidi:
+        if dosya not in _onbellekler:
+            _onbellekler[dosya] = KosulluIstekOnbellegi(dosya)
+        return _onbellekler[dosya]
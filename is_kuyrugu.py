@@ -0,0 +1,142 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+class IsKuyrugu:
+    """Uzun süren işler (AI yeniden yazma, WordPress yayını) için yerel iş kuyruğu
+
+    Her arka uç (gemini, wordpress) kendi sınırlı işçi havuzuna sahiptir;
+    fazla işler sırada bekler, web isteği iş ID'sini alıp hemen döner.
+    Sonuç /api/isler/<id> üzerinden sorgulanır (bekle=sn ile uzun sorgu).
+    Arka uç sınırı bir semafordur; kuyruk dışında aynı servise giden
+    çağrılar (AI akışı) yer_al/yer_birak ile aynı sınırı paylaşır.
+    """
+
+    def __init__(self, arka_uc_limitleri=None, saklama_sn=3600):
+        self.limitler = dict(arka_uc_limitleri or {'gemini': 2, 'wordpress': 2})
+        self.saklama_sn = saklama_sn
+        self._kilit = threading.Lock()
+        self._havuzlar = {}
+        self._sinirlayicilar = {}
+        self._isler = {}
+        self._olaylar = {}
+
+    def _havuz(self, arka_uc):
+        with self._kilit:
+            if arka_uc not in self._havuzlar:
+                self._havuzlar[arka_uc] = ThreadPoolExecutor(
+                    max_workers=self.limitler.get(arka_uc, 1), thread_name_prefix=f'is-{arka_uc}'
+                )
+            return self._havuzlar[arka_uc]
+
+    def _sinirlayici(self, arka_uc):
+        with self._kilit:
+            if arka_uc not in self._sinirlayicilar:
+                self._sinirlayicilar[arka_uc] = threading.BoundedSemaphore(self.limitler.get(arka_uc, 1))
+            return self._sinirlayicilar[arka_uc]
+
+    def yer_al(self, arka_uc, zaman_asimi=0):
+        """Kuyruk dışındaki bir çağrı için arka uçta yer ayır; yer yoksa False"""
+        if zaman_asimi:
+            return self._sinirlayici(arka_uc).acquire(timeout=zaman_asimi)
+        return self._sinirlayici(arka_uc).acquire(blocking=False)
+
+    def yer_birak(self, arka_uc):
+        self._sinirlayici(arka_uc).release()
+
+    def gonder(self, arka_uc, tur, islem, *args, **kwargs):
+        """İşi kuyruğa ekle ve ID'sini döndür"""
+        self.temizle()
+
+        is_id = uuid.uuid4().hex[:12]
+        with self._kilit:
+            self._isler[is_id] = {
+                'id': is_id,
+                'tur': tur,
+                'arka_uc': arka_uc,
+                'durum': 'kuyrukta',
+                'olusturma': time.time(),
+                'baslama': None,
+                'bitis': None,
+                'sonuc': None,
+                'hata': None
+            }
+            self._olaylar[is_id] = threading.Event()
+
+        self._havuz(arka_uc).submit(self._calistir, is_id, islem, args, kwargs)
+        return is_id
+
+    def _calistir(self, is_id, islem, args, kwargs):
+        with self._kilit:
+            is_kaydi = self._isler[is_id]
+
+        # Kuyruk dışı çağrılar yer tutuyorsa iş sırada beklemeye devam eder
+        sinirlayici = self._sinirlayici(is_kaydi['arka_uc'])
+        sinirlayici.acquire()
+        with self._kilit:
+            is_kaydi['durum'] = 'calisiyor'
+            is_kaydi['baslama'] = time.time()
+
+        try:
+            sonuc = islem(*args, **kwargs)
+            durum, hata = 'tamamlandi', None
+        except Exception as e:
+            print(f"❌ İş hatası ({is_kaydi['tur']} {is_id}): {e}")
+            sonuc, durum, hata = None, 'hata', str(e)
+        finally:
+            sinirlayici.release()
+
+        with self._kilit:
+            is_kaydi.update(durum=durum, sonuc=sonuc, hata=hata, bitis=time.time())
+        self._olaylar[is_id].set()
+
+    def durum(self, is_id, bekle=0):
+        """İşin durumunu döndür; bekle > 0 ise bitene kadar en fazla o kadar bekle"""
+        olay = self._olaylar.get(is_id)
+        if olay is None:
+            return None
+        if bekle:
+            olay.wait(bekle)
+
+        with self._kilit:
+            if is_id not in self._isler:
+                return None
+            is_kaydi = dict(self._isler[is_id])
+            sira = None
+            if is_kaydi['durum'] == 'kuyrukta':
+                sira = sum(1 for i in self._isler.values()
+                           if i['arka_uc'] == is_kaydi['arka_uc'] and i['durum'] == 'kuyrukta'
+                           and i['olusturma'] < is_kaydi['olusturma'])
+
+        return {
+            'is_id': is_id,
+            'tur': is_kaydi['tur'],
+            'durum': is_kaydi['durum'],
+            'bitti': is_kaydi['durum'] in ('tamamlandi', 'hata'),
+            'sira': sira,
+            'sonuc': is_kaydi['sonuc'],
+            'hata': is_kaydi['hata'],
+            'olusturma': datetime.fromtimestamp(is_kaydi['olusturma']).strftime('%Y-%m-%d %H:%M:%S'),
+            'bekleme_sn': round((is_kaydi['baslama'] or time.time()) - is_kaydi['olusturma'], 1),
+            'calisma_sn': round(is_kaydi['bitis'] - is_kaydi['baslama'], 1) if is_kaydi['bitis'] else None
+        }
+
+    def temizle(self):
+        """Saklama süresi geçmiş bitmiş işleri sil"""
+        sinir = time.time() - self.saklama_sn
+        with self._kilit:
+            for is_id in [i for i, k in self._isler.items() if k['bitis'] and k['bitis'] < sinir]:
+                del self._isler[is_id]
+                del self._olaylar[is_id]
+
+    def istatistikler(self):
+        with self._kilit:
+            ozet = {arka_uc: {'limit': limit, 'kuyrukta': 0, 'calisiyor': 0, 'tamamlandi': 0, 'hata': 0}
+                    for arka_uc, limit in self.limitler.items()}
+            for is_kaydi in self._isler.values():
+                arka_uc = ozet.setdefault(is_kaydi['arka_uc'],
+                                          {'limit': 1, 'kuyrukta': 0, 'calisiyor': 0, 'tamamlandi': 0, 'hata': 0})
+                arka_uc[is_kaydi['durum']] += 1
+            return ozet
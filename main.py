@@ -1,6 +1,8 @@
-from flask import Flask, render_template, request, jsonify, session, redirect, url_for, flash, send_from_directory
+from flask import Flask, render_template, request, jsonify, session, redirect, url_for, flash, send_from_directory, stream_with_context, abort, make_response
+from werkzeug.security import safe_join
+from urllib.parse import quote
+from markupsafe import Markup
 import requests
-from bs4 import BeautifulSoup
 import json
 import re
 import time
@@ -10,11 +12,23 @@ from datetime import datetime
 import google.generativeai as genai
 from requests.auth import HTTPBasicAuth
 import haber_kaynaklari
-from PIL import Image
+import http_istemci
+import html_ayristirici
+import secici_plani
+import haber_deposu
+import zamanlayici
+import haber_indeksi
+import sayfa_onbellegi
+import wordpress_onbellek
+import yayin_hatti
+import is_kuyrugu
+import ai_onbellek
+import toplu_ai
+import resim_hatti
+import resim_katalogu
 import threading
+import mimetypes
 from pathlib import Path
-from werkzeug.utils import secure_filename
-import uuid
 from urllib.parse import urljoin, urlparse
 import hashlib
 
@@ -29,12 +43,69 @@ def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
 class HaberYoneticisi:
+    # _ai_prompt değişince artırılmalı (önbellekteki eski sonuçlar kullanılmasın)
+    AI_PROMPT_SURUMU = 1
+    AI_AKIS_PROMPT_SURUMU = 'akis-1'
+    # Akış modunda HTML ile sondaki JSON meta verisini ayıran satır
+    AI_AKIS_AYRACI = '===META==='
+    
     def __init__(self):
         self.load_config()
-        self.haberler = []
+        # Scraper, link çekici, resim indirici ve WordPress ortak havuzu kullanır
+        self.http = http_istemci.varsayilan_istemci(getattr(self, 'config', None))
+        self.html_parser = html_ayristirici.motor_sec(getattr(self, 'config', None))
+        self.depo_hazirla()
+        settings = getattr(self, 'config', {}).get('settings', {})
+        self.kategori_onbellegi = wordpress_onbellek.KategoriOnbellegi(
+            self.kategorileri_wpden_cek,
+            settings.get('category_cache_file', 'kategoriler.json'),
+            ttl=settings.get('category_cache_ttl', 600)
+        )
+        self.etiket_onbellegi = wordpress_onbellek.EtiketOnbellegi(
+            self.http, f"{getattr(self, 'WORDPRESS_URL', '')}/wp-json/wp/v2/tags",
+            auth=getattr(self, 'WP_AUTH', None),
+            dosya=settings.get('tag_cache_file', 'etiketler.json'),
+            yenileme_saat=settings.get('tag_cache_rewarm_hours', 24)
+        )
+        self.yayin_hatti = yayin_hatti.YayinHatti(
+            self.http, getattr(self, 'WORDPRESS_URL', ''), getattr(self, 'WP_AUTH', None),
+            self.etiket_onbellegi,
+            dosya=settings.get('publish_log_file', 'yayin_kayitlari.json'),
+            deneme=settings.get('publish_retries', 3)
+        )
+        self.ai_onbellegi = ai_onbellek.AISonucOnbellegi(
+            settings.get('ai_cache_file', 'ai_sonuclari.db'),
+            max_kayit=settings.get('ai_cache_max_items', 2000),
+            ttl_gun=settings.get('ai_cache_ttl_days', 30)
+        )
+        self._yenileme_kilidi = threading.Lock()
+        self._site_haberleri = {}  # site -> son çekilen haberler (kaynak bazlı zamanlama için)
+        self.indeks = haber_indeksi.HaberIndeksi()  # ID, link, kaynak ve durum indeksli haberler
         self.secili_haber = None
-        self.link_haberleri = []  # Link'ten çekilen haberler için ayrı liste
+        self.link_haberleri = {}  # Link'ten çekilen haberler için ayrı kayıt (url -> haber)
+        self.link_metrikleri = {'adet': 0, 'toplam_ms': 0.0, 'son_ms': 0.0, 'max_ms': 0.0}
+        self.toplu_yazici = None  # İş kuyruğu kurulunca atanır (toplu AI taslakları)
+        self.isler = None  # İş kuyruğu; AI akışı kuyruktaki 'gemini' sınırını paylaşır
+        # İndirilen ve yüklenen resimler süreç havuzunda işlenir, içerik hash'iyle saklanır
+        self.resimler = resim_hatti.ResimHatti(
+            getattr(self, 'IMAGE_FOLDER', 'static/images'),
+            max_workers=settings.get('image_workers', 2),
+            turler=settings.get('image_derivatives')
+        )
+        # Editör resim listesi klasör taraması yerine katalogdan gelir
+        self.resim_katalogu = resim_katalogu.ResimKatalogu(
+            self.resimler, settings.get('image_catalog_file', 'resim_katalogu.db')
+        )
         
+    @property
+    def haberler(self):
+        """Tüm haberler - indeksin o anki listesi"""
+        return self.indeks.tumu()
+
+    @haberler.setter
+    def haberler(self, haberler):
+        self.indeks.yayinla(haberler)
+
     def load_config(self):
         """Konfigürasyon yükleme"""
         try:
@@ -49,6 +120,7 @@ class HaberYoneticisi:
             
             # AI ayarları
             self.GOOGLE_AI_KEY = self.config['google_ai']['api_key']
+            self.AI_MODEL = self.config['settings'].get('ai_model', 'gemini-2.0-flash-exp')
             genai.configure(api_key=self.GOOGLE_AI_KEY)
             
             # Diğer ayarlar
@@ -65,6 +137,18 @@ class HaberYoneticisi:
             self.IMAGE_FOLDER = 'static/images'
             app.config['UPLOAD_FOLDER'] = self.IMAGE_FOLDER
 
+    def depo_hazirla(self):
+        """Görülen haber deposunu aç, eski JSON geçmişini bir kez aktar"""
+        settings = getattr(self, 'config', {}).get('settings', {})
+        self.depo = haber_deposu.GorulenHaberDeposu(
+            settings.get('seen_db_file', 'gorulen_haberler.db'),
+            ttl_gun=settings.get('seen_ttl_days', 30)
+        )
+        
+        for dosya in [getattr(self, 'ONCEKI_HABERLER_FILE', None),
+                      getattr(self, 'ONCEKI_GUNCEL_HABERLER_FILE', None)]:
+            self.depo.json_dan_aktar(dosya)
+
     def link_haber_cek(self, url):
         """Verilen linkten haber içeriğini çek - Geliştirilmiş versiyon"""
         try:
@@ -98,14 +182,14 @@ class HaberYoneticisi:
                 'DNT': '1'
             }
             
-            response = requests.get(url, headers=headers, timeout=30, allow_redirects=True)
+            response = self.http.get(url, headers=headers, timeout=30, allow_redirects=True)
             response.raise_for_status()
             
             # Encoding düzelt
             if response.encoding in ['ISO-8859-1', None] or response.apparent_encoding:
                 response.encoding = response.apparent_encoding or 'utf-8'
             
-            soup = BeautifulSoup(response.text, 'html.parser', from_encoding='utf-8')
+            soup = html_ayristirici.ayristir(response.text, self.html_parser, tam_api=True)
             
             # Başlık çekme - Sondakika.com için spesifik
             baslik = ""
@@ -256,13 +340,13 @@ class HaberYoneticisi:
                 'Connection': 'keep-alive'
             }
             
-            response = requests.get(url, headers=headers, timeout=30, allow_redirects=True)
+            response = self.http.get(url, headers=headers, timeout=30, allow_redirects=True)
             response.raise_for_status()
             
             if response.encoding == 'ISO-8859-1' or response.apparent_encoding:
                 response.encoding = response.apparent_encoding or 'utf-8'
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = html_ayristirici.ayristir(response.content, self.html_parser, tam_api=True)
             
             # Başlık çekme
             baslik = ""
@@ -390,6 +474,22 @@ class HaberYoneticisi:
         except Exception as e:
             return {'success': False, 'error': f'Genel haber çekme hatası: {str(e)}'}
 
+    def link_haberi_birlestir(self, haber):
+        """Link haberini scraper'ları çalıştırmadan listeye ekle veya güncelle"""
+        # İndekste varsa güncellenir, yoksa eklenir (indeks eski alanları kendisi karşılaştırır)
+        haber = self.indeks.ekle_veya_guncelle(haber)
+        self.link_haberleri[haber.get('url')] = haber
+        return haber
+
+    def link_metrigi_kaydet(self, sure_ms):
+        """Link ile haber ekleme süresini kaydet"""
+        m = self.link_metrikleri
+        m['adet'] += 1
+        m['toplam_ms'] += sure_ms
+        m['son_ms'] = sure_ms
+        m['max_ms'] = max(m['max_ms'], sure_ms)
+        print(f"🔗 Link haberi {sure_ms:.0f} ms'de eklendi (ort. {m['toplam_ms'] / m['adet']:.0f} ms)")
+
     def url_cikart(self, metin):
         """Metinden URL'yi çıkart"""
         try:
@@ -412,57 +512,24 @@ class HaberYoneticisi:
     def haber_guncelle(self, haber_id, yeni_baslik=None, yeni_aciklama=None):
         """Haber bilgilerini güncelle"""
         try:
-            # Ana haber listesinde bul ve güncelle
-            for haber in self.haberler:
-                if haber.get('id') == haber_id:
-                    if yeni_baslik:
-                        haber['baslik'] = yeni_baslik
-                    if yeni_aciklama:
-                        haber['description'] = yeni_aciklama
-                    return True
-            
-            # Link haberlerinde bul ve güncelle
-            for haber in self.link_haberleri:
-                if haber.get('id') == haber_id:
-                    if yeni_baslik:
-                        haber['baslik'] = yeni_baslik
-                    if yeni_aciklama:
-                        haber['description'] = yeni_aciklama
-                    return True
-            
-            return False
-            
-        except Exception as e:
-            print(f"Haber güncelleme hatası: {e}")
-            return False
-        """Haber bilgilerini güncelle"""
-        try:
-            # Ana haber listesinde bul ve güncelle
-            for haber in self.haberler:
-                if haber.get('id') == haber_id:
-                    if yeni_baslik:
-                        haber['baslik'] = yeni_baslik
-                    if yeni_aciklama:
-                        haber['description'] = yeni_aciklama
-                    return True
-            
-            # Link haberlerinde bul ve güncelle
-            for haber in self.link_haberleri:
-                if haber.get('id') == haber_id:
-                    if yeni_baslik:
-                        haber['baslik'] = yeni_baslik
-                    if yeni_aciklama:
-                        haber['description'] = yeni_aciklama
-                    return True
+            alanlar = {}
+            if yeni_baslik:
+                alanlar['baslik'] = yeni_baslik
+            if yeni_aciklama:
+                alanlar['description'] = yeni_aciklama
             
-            return False
+            return self.indeks.alanlari_guncelle(haber_id, alanlar) is not None
             
         except Exception as e:
             print(f"Haber güncelleme hatası: {e}")
             return False
 
-    def resim_indir_ve_kaydet(self, resim_url, dosya_adi=None):
-        """URL'den resmi indir ve kaydet"""
+    def resim_indir_ve_kaydet(self, resim_url, haber=None):
+        """URL'den resmi indir ve kaydet
+        
+        Dosya adı içerik hash'inden üretilir; aynı resim daha önce kaydedildiyse
+        yeniden işlenmez. Resim, kaynak haberiyle birlikte kataloğa yazılır.
+        """
         try:
             if not resim_url:
                 return None
@@ -471,117 +538,129 @@ class HaberYoneticisi:
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
             }
             
-            response = requests.get(resim_url, headers=headers, timeout=30)
+            response = self.http.get(resim_url, headers=headers, timeout=30)
             response.raise_for_status()
             
-            # Dosya uzantısını belirle
-            content_type = response.headers.get('content-type', '')
-            uzanti = '.jpg'  # default
-            
-            if 'png' in content_type:
-                uzanti = '.png'
-            elif 'gif' in content_type:
-                uzanti = '.gif'
-            elif 'webp' in content_type:
-                uzanti = '.webp'
-            
-            # Dosya adı oluştur
-            if not dosya_adi:
-                dosya_adi = f"link_resim_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            
-            dosya_adi = dosya_adi + uzanti
-            dosya_yolu = os.path.join(self.IMAGE_FOLDER, dosya_adi)
-            
-            # Klasör oluştur
-            os.makedirs(self.IMAGE_FOLDER, exist_ok=True)
-            
-            # Resmi kaydet
-            with open(dosya_yolu, 'wb') as f:
-                f.write(response.content)
-            
-            # Resmi optimize et
-            try:
-                with Image.open(dosya_yolu) as img:
-                    # RGBA'yı RGB'ye çevir
-                    if img.mode in ('RGBA', 'LA', 'P'):
-                        background = Image.new('RGB', img.size, (255, 255, 255))
-                        if img.mode == 'P':
-                            img = img.convert('RGBA')
-                        background.paste(img, mask=img.split()[-1] if img.mode == 'RGBA' else None)
-                        img = background
-                    
-                    # Boyut kontrolü
-                    max_size = (1200, 800)
-                    if img.size[0] > max_size[0] or img.size[1] > max_size[1]:
-                        img.thumbnail(max_size, Image.Resampling.LANCZOS)
-                    
-                    # JPEG olarak kaydet
-                    final_dosya = os.path.splitext(dosya_adi)[0] + '.jpg'
-                    final_yol = os.path.join(self.IMAGE_FOLDER, final_dosya)
-                    
-                    img.save(final_yol, 'JPEG', quality=85, optimize=True)
-                    
-                    # Orijinal dosyayı sil (eğer farklıysa)
-                    if final_yol != dosya_yolu:
-                        os.remove(dosya_yolu)
-                    
-                    return final_dosya
-                    
-            except Exception as e:
-                print(f"Resim optimize hatası: {e}")
-                return dosya_adi
+            # Yanıt gövdesi diske yazılmadan bellekte işlenir
+            dosya_adi = self.resimler.kaydet(response.content)
+            if dosya_adi:
+                self.resim_katalogu.ekle(dosya_adi, haber, kaynak_url=resim_url)
+            return dosya_adi
                 
         except Exception as e:
             print(f"Resim indirme hatası: {e}")
             return None
             
-    def haberleri_yenile(self):
-        """Haberleri yeniden çek"""
+    def yenileme_devam_ediyor(self):
+        return self._yenileme_kilidi.locked()
+
+    def aktif_kaynaklar(self):
+        """Zamanlayıcının takip edeceği etkin haber siteleri"""
+        return haber_kaynaklari.MultiNewsSource(self.config).get_active_sources()
+
+    def haberleri_yenile(self, kaynaklar=None):
+        """Haberleri yeniden çek
+        
+        kaynaklar verilirse sadece o siteler çekilir, diğer sitelerin son sonuçları
+        korunur. Aynı anda tek yenileme çalışır ve yeni liste hazır olduğunda tek
+        atamayla yayınlanır; sayfa görüntülemeleri scrape'i beklemez.
+        """
+        if not self._yenileme_kilidi.acquire(blocking=False):
+            print("⏳ Haber yenileme zaten çalışıyor, atlandı")
+            return False, 0
+        
         try:
-            # Önceki haberleri yükle
-            onceki_istanbul = self.onceki_haberler_yukle(self.ONCEKI_HABERLER_FILE)
-            onceki_guncel = self.onceki_haberler_yukle(self.ONCEKI_GUNCEL_HABERLER_FILE)
+            # Süresi dolan geçmiş kayıtlarını temizle
+            self.depo.suresi_dolanlari_sil()
             
-            # Yeni haberleri kontrol et
+            # Yeni haberleri kontrol et - geçmiş depodan sorgulanır
             yeni_istanbul, yeni_guncel, yeni_gelen, kaynak = haber_kaynaklari.sirali_haber_kontrol(
-                self.config, onceki_istanbul, onceki_guncel
+                self.config, depo=self.depo, kaynaklar=kaynaklar
             )
             
-            # Haberleri birleştir
-            self.haberler = []
+            # Çekilen sitelerin sonuçlarını güncelle, diğerlerini koru
+            cekilen = {}
+            for haber in yeni_istanbul:
+                haber.setdefault('site', haber.get('kaynak', ''))
+                cekilen.setdefault(haber['site'], []).append(haber)
+            
+            if kaynaklar is None:
+                self._site_haberleri = cekilen
+            else:
+                for site in kaynaklar:
+                    self._site_haberleri[site] = cekilen.get(site, [])
+                yeni_istanbul = haber_kaynaklari.MultiNewsSource(self.config).sort_news_by_priority(
+                    [h for haberler in self._site_haberleri.values() for h in haberler]
+                )
+            
+            # Haberleri birleştir - yayınlanana kadar yerel listede
+            haberler = []
+            yeni_linkler = {h.get('link') for h in yeni_gelen}
             
             # Son 50 İstanbul haberi
             for haber in yeni_istanbul[-50:]:
+                if haber.get('site') in cekilen:
+                    haber['durum'] = 'Yeni' if haber.get('link') in yeni_linkler else 'Eski'
                 haber['kaynak'] = 'İstanbul'
-                haber['durum'] = 'Yeni' if haber in yeni_gelen else 'Eski'
-                haber['id'] = str(uuid.uuid4())[:8]
-                self.haberler.append(haber)
+                haber['id'] = haber_indeksi.kararli_id(haber)
+                haberler.append(haber)
             
             # Son 50 Güncel haber  
             for haber in yeni_guncel[-50:]:
                 haber['kaynak'] = 'Güncel'
-                haber['durum'] = 'Yeni' if haber in yeni_gelen else 'Eski'
-                haber['id'] = str(uuid.uuid4())[:8]
-                self.haberler.append(haber)
+                haber['durum'] = 'Yeni' if haber.get('link') in yeni_linkler else 'Eski'
+                haber['id'] = haber_indeksi.kararli_id(haber)
+                haberler.append(haber)
             
             # Link haberlerini de ekle
-            self.haberler.extend(self.link_haberleri)
+            haberler.extend(self.link_haberleri.values())
+            
+            # Önceki döngüde üretilmiş AI taslakları yeni kayıtlara taşınır
+            for haber in haberler:
+                if 'ai_taslak' not in haber:
+                    onceki = self.indeks.bul(haber['id'])
+                    if onceki is not None and onceki.get('ai_taslak'):
+                        haber['ai_taslak'] = onceki['ai_taslak']
+            
+            # Atomik yayınla
+            self.haberler = haberler
+            
+            # Yeni haberlerin AI taslakları arka planda (ayarda açıksa)
+            if self.toplu_yazici is not None:
+                self.toplu_yazici.kuyruga_al(self.indeks.duruma_gore('Yeni'))
             
             return True, len(yeni_gelen)
             
         except Exception as e:
             print(f"Haber çekme hatası: {e}")
             return False, 0
-            
-    def ai_ile_yeniden_yaz(self, haber):
-        """AI ile haberi SEO uyumlu olarak yeniden yaz"""
-        try:
-            haber_metni = haber.get('haber_metni', '')
-            baslik = haber.get('baslik', haber.get('headline', ''))
-            description = haber.get('description', '')
-            
-            # AI prompt
-            prompt = f"""
+        finally:
+            self._yenileme_kilidi.release()
+            
+    def _ai_prompt(self, baslik, description, haber_metni, akis=False):
+        """Yeniden yazma prompt'u; akış modunda önce HTML, ayraçtan sonra JSON meta istenir"""
+        if akis:
+            cikti = f"""
+            ÖNCE SADECE HTML içeriğini döndür (kod bloğu kullanma) - h1 başlık, içindekiler, h2 alt başlıklar ve paragraflar.
+            HTML bittikten sonra tek başına bir satıra {self.AI_AKIS_AYRACI} yaz ve ardından SADECE şu JSON'u döndür:
+            {{
+              "etiketler": ["maksimum 4 adet SEO uyumlu etiket"],
+              "aciklama": "150-160 karakter arası çarpıcı SEO açıklaması",
+              "kelime_sayisi": kelime_sayısı
+            }}
+"""
+        else:
+            cikti = """
+            SADECE JSON formatında döndür:
+            {
+              "icerik": "HTML içeriği - h1 başlık, içindekiler, h2 alt başlıklar ve paragraflar",
+              "etiketler": ["maksimum 4 adet SEO uyumlu etiket"],
+              "aciklama": "150-160 karakter arası çarpıcı SEO açıklaması",
+              "kelime_sayisi": kelime_sayısı
+            }
+"""
+        
+        return f"""
             Aşağıdaki haber metnini 600-700 kelime arasında, SEO uyumlu ve profesyonel bir şekilde yeniden yaz.
 
             ÖNEMLİ KURALLAR:
@@ -594,15 +673,7 @@ class HaberYoneticisi:
             - HTML formatında döndür
             - MAKSIMUM 4 adet SEO uyumlu etiket oluştur
             - Çarpıcı ve SEO uyumlu bir açıklama (meta description) yaz (150-160 karakter)
-
-            SADECE JSON formatında döndür:
-            {{
-              "icerik": "HTML içeriği - h1 başlık, içindekiler, h2 alt başlıklar ve paragraflar",
-              "etiketler": ["maksimum 4 adet SEO uyumlu etiket"],
-              "aciklama": "150-160 karakter arası çarpıcı SEO açıklaması",
-              "kelime_sayisi": kelime_sayısı
-            }}
-
+{cikti}
             HTML formatı:
             - <h1> ana başlık
             - <div class="wp-block-yoast-seo-table-of-contents yoast-table-of-contents"><h2>İçindekiler</h2><ul><li><a href="#h-baslik" data-level="2">Başlık</a></li></ul></div>
@@ -615,8 +686,31 @@ class HaberYoneticisi:
             AÇIKLAMA: {description}
             HABER METNİ: {haber_metni}
             """
+    
+    def ai_ile_yeniden_yaz(self, haber, yeniden_olustur=False, izin=None):
+        """AI ile haberi SEO uyumlu olarak yeniden yaz (aynı içerik için önbellekten)
+        
+        izin verilirse Gemini çağrısından hemen önce çağrılır; False dönerse
+        (kota/hız sınırı) çağrı yapılmaz.
+        """
+        try:
+            haber_metni = haber.get('haber_metni', '')
+            baslik = haber.get('baslik', haber.get('headline', ''))
+            description = haber.get('description', '')
+            model_adi = getattr(self, 'AI_MODEL', 'gemini-2.0-flash-exp')
+            
+            anahtar = ai_onbellek.sonuc_anahtari(self.AI_PROMPT_SURUMU, model_adi,
+                                                 baslik, description, haber_metni)
+            onbellekteki = self.ai_onbellegi.al(anahtar, zorla=yeniden_olustur)
+            if onbellekteki is not None:
+                return dict(onbellekteki, onbellekten=True)
             
-            model = genai.GenerativeModel("gemini-2.0-flash-exp")
+            prompt = self._ai_prompt(baslik, description, haber_metni)
+            
+            if izin is not None and not izin():
+                return {'success': False, 'error': 'AI kotası doldu veya hız sınırına takıldı', 'izin_yok': True}
+            
+            model = genai.GenerativeModel(model_adi)
             response = model.generate_content(prompt)
             
             # JSON temizle ve parse et
@@ -625,17 +719,109 @@ class HaberYoneticisi:
             
             ai_data = json.loads(ai_yazip)
             
-            return {
+            sonuc = {
                 'success': True,
                 'icerik': ai_data.get('icerik', ''),
                 'etiketler': ai_data.get('etiketler', [])[:4],  # Maksimum 4 etiket
                 'aciklama': ai_data.get('aciklama', ''),
                 'kelime_sayisi': ai_data.get('kelime_sayisi', 0)
             }
+            self.ai_onbellegi.kaydet(anahtar, sonuc)
+            
+            return dict(sonuc, onbellekten=False)
             
         except Exception as e:
             return {'success': False, 'error': str(e)}
             
+    def ai_ile_yeniden_yaz_akis(self, haber, yeniden_olustur=False):
+        """AI ile yeniden yazmayı akış halinde üret
+        
+        ('parca', html) olayları Gemini'den geldikçe, en sonda ('bitti', sonuc)
+        veya ('hata', mesaj) üretilir; Gemini sınırı doluysa sadece ('mesgul', mesaj).
+        Sonuç ai_ile_yeniden_yaz ile aynı yapıdadır.
+        """
+        haber_metni = haber.get('haber_metni', '')
+        baslik = haber.get('baslik', haber.get('headline', ''))
+        description = haber.get('description', '')
+        model_adi = getattr(self, 'AI_MODEL', 'gemini-2.0-flash-exp')
+        
+        anahtar = ai_onbellek.sonuc_anahtari(self.AI_AKIS_PROMPT_SURUMU, model_adi,
+                                             baslik, description, haber_metni)
+        onbellekteki = self.ai_onbellegi.al(anahtar, zorla=yeniden_olustur)
+        if onbellekteki is None and not yeniden_olustur:
+            # Akışsız üretilmiş sonuç da aynı haber için geçerli
+            onbellekteki = self.ai_onbellegi.al(ai_onbellek.sonuc_anahtari(
+                self.AI_PROMPT_SURUMU, model_adi, baslik, description, haber_metni))
+        if onbellekteki is not None:
+            yield 'bitti', dict(onbellekteki, onbellekten=True)
+            return
+        
+        # Kuyruktaki 'gemini' işleriyle aynı sınır; yer yoksa bağlantı bekletilmez,
+        # istemci kuyruğa düşer
+        if not self.isler.yer_al('gemini'):
+            yield 'mesgul', 'AI şu anda meşgul, istek kuyruğa alınıyor'
+            return
+        
+        try:
+            model = genai.GenerativeModel(model_adi)
+            response = model.generate_content(self._ai_prompt(baslik, description, haber_metni, akis=True),
+                                              stream=True)
+            
+            tampon = ''
+            gonderilen = 0
+            ayrac_yeri = -1
+            for chunk in response:
+                tampon += chunk.text or ''
+                if ayrac_yeri >= 0:
+                    continue
+                
+                # Baştaki ```html satırı editöre gönderilmez
+                if gonderilen == 0 and tampon.lstrip().startswith('```'):
+                    if '\n' not in tampon:
+                        continue
+                    gonderilen = tampon.index('\n') + 1
+                
+                ayrac_yeri = tampon.find(self.AI_AKIS_AYRACI)
+                # Ayraç iki parçaya bölünmüş olabilir; sonu ayraç uzunluğu kadar bekletilir
+                son = ayrac_yeri if ayrac_yeri >= 0 else max(gonderilen, len(tampon) - len(self.AI_AKIS_AYRACI))
+                if son > gonderilen:
+                    yield 'parca', tampon[gonderilen:son]
+                    gonderilen = son
+            
+            if ayrac_yeri < 0:
+                ayrac_yeri = len(tampon)
+            if gonderilen < ayrac_yeri:
+                yield 'parca', tampon[gonderilen:ayrac_yeri]
+            
+            icerik = re.sub(r'^\s*```(?:html)?\s*|\s*```\s*$', '', tampon[:ayrac_yeri])
+            meta_metni = self.json_temizle(tampon[ayrac_yeri + len(self.AI_AKIS_AYRACI):])
+            # İçerik editöre akmış durumda; bozuk META yüzünden metin kaybedilmez
+            try:
+                meta = json.loads(meta_metni) if meta_metni else {}
+            except ValueError:
+                meta = None
+            meta_gecerli = isinstance(meta, dict)
+            if not meta_gecerli:
+                print(f"⚠️ AI META bölümü okunamadı, etiket ve açıklama boş bırakıldı: {meta_metni[:100]!r}")
+                meta = {}
+            
+            sonuc = {
+                'success': True,
+                'icerik': icerik,
+                'etiketler': list(meta.get('etiketler') or [])[:4],  # Maksimum 4 etiket
+                'aciklama': meta.get('aciklama', ''),
+                'kelime_sayisi': meta.get('kelime_sayisi') or len(re.sub(r'<[^>]+>', ' ', icerik).split())
+            }
+            # Eksik sonuç önbelleğe yazılmaz; sonraki istek etiketleri yeniden üretebilir
+            if meta_gecerli:
+                self.ai_onbellegi.kaydet(anahtar, sonuc)
+            yield 'bitti', dict(sonuc, onbellekten=False)
+            
+        except Exception as e:
+            yield 'hata', str(e)
+        finally:
+            self.isler.yer_birak('gemini')
+            
     def json_temizle(self, ai_yazip):
         """JSON metnini temizle"""
         if not ai_yazip:
@@ -657,161 +843,111 @@ class HaberYoneticisi:
         
         return icerik.strip()
         
-    def onceki_haberler_yukle(self, dosya):
-        """Önceki haberleri yükle"""
-        if os.path.exists(dosya):
-            try:
-                with open(dosya, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except:
-                return []
-        return []
-        
     def kategorileri_yukle(self):
-        """WordPress kategorilerini yükle"""
+        """WordPress kategorilerini yükle (önbellekten, bayatsa arka planda yenilenir)"""
+        return self.kategori_onbellegi.al()
+
+    def kategorileri_wpden_cek(self):
+        """Tüm WordPress kategorilerini sayfa sayfa çek (hata olursa None)"""
         try:
-            response = requests.get(f'{self.WORDPRESS_URL}/wp-json/wp/v2/categories', 
-                                  auth=self.WP_AUTH, params={'per_page': 100})
-            
-            if response.status_code == 200:
-                return response.json()
-            return []
+            return wordpress_onbellek.tum_sayfalari_cek(
+                self.http, f'{self.WORDPRESS_URL}/wp-json/wp/v2/categories', auth=self.WP_AUTH
+            )
         except Exception as e:
             print(f"Kategori yükleme hatası: {e}")
-            return []
+            return None
             
-    def haberi_yayinla(self, baslik, icerik, etiketler, kategori_id=None, resim_yolu=None):
-        """Haberi WordPress'e yayınla"""
+    def haberi_yayinla(self, baslik, icerik, etiketler, kategori_id=None, resim_yolu=None, zorla=False):
+        """Haberi WordPress'e yayınla (kapak ve etiketler paralel, tekrar denemeler idempotent)"""
         try:
-            # Kapak fotoğrafı yükle
-            kapak_fotografi_id = None
-            if resim_yolu and os.path.exists(resim_yolu):
-                kapak_fotografi_id = self.wordpress_medya_yukle(resim_yolu)
-            
-            # Etiket ID'lerini al
-            tag_ids = []
-            for etiket in etiketler:
-                tag_id = self.etiket_olustur_veya_bul(etiket)
-                if tag_id:
-                    tag_ids.append(tag_id)
-            
-            data = {
-                'title': baslik,
-                'content': icerik,
-                'status': 'publish',
-                'tags': tag_ids
-            }
-            
-            if kategori_id:
-                data['categories'] = [kategori_id]
-            
-            if kapak_fotografi_id:
-                data['featured_media'] = kapak_fotografi_id
-            
-            response = requests.post(f'{self.WORDPRESS_URL}/wp-json/wp/v2/posts', 
-                                   auth=self.WP_AUTH, json=data)
-            
-            if response.status_code == 201:
-                post_data = response.json()
-                return {'success': True, 'link': post_data.get('link', 'Link alınamadı')}
-            else:
-                return {'success': False, 'error': f"HTTP {response.status_code}: {response.text}"}
-                
+            return self.yayin_hatti.yayinla(baslik, icerik, etiketler, kategori_id, resim_yolu, zorla=zorla)
         except Exception as e:
             return {'success': False, 'error': str(e)}
             
     def wordpress_medya_yukle(self, dosya_yolu):
-        """WordPress'e medya yükle"""
+        """WordPress'e medya yükle (aynı dosya ikinci kez yüklenmez)"""
         try:
-            if not os.path.exists(dosya_yolu):
-                return None
-            
-            mime_types = {'.jpg': 'image/jpeg', '.jpeg': 'image/jpeg', '.png': 'image/png', 
-                         '.gif': 'image/gif', '.webp': 'image/webp', '.bmp': 'image/bmp'}
-            
-            dosya_adi = os.path.basename(dosya_yolu)
-            uzanti = os.path.splitext(dosya_adi)[1].lower()
-            content_type = mime_types.get(uzanti, 'image/jpeg')
-            
-            with open(dosya_yolu, 'rb') as f:
-                headers = {
-                    'Content-Type': content_type,
-                    'Content-Disposition': f'attachment; filename="{dosya_adi}"'
-                }
-                
-                response = requests.post(f'{self.WORDPRESS_URL}/wp-json/wp/v2/media', 
-                                       auth=self.WP_AUTH, headers=headers, data=f.read())
-                
-                if response.status_code == 201:
-                    return response.json().get('id')
-            return None
-            
+            return self.yayin_hatti.medya_yukle(dosya_yolu)
         except:
             return None
             
     def etiket_olustur_veya_bul(self, etiket_adi):
-        """Etiket oluştur veya bul"""
+        """Etiket oluştur veya bul (önce yerel etiket önbelleğine bakılır)"""
         try:
-            # Önce var mı kontrol et
-            response = requests.get(f'{self.WORDPRESS_URL}/wp-json/wp/v2/tags', 
-                                   auth=self.WP_AUTH, params={'search': etiket_adi})
-            
-            if response.status_code == 200:
-                for tag in response.json():
-                    if tag['name'].lower() == etiket_adi.lower():
-                        return tag['id']
-            
-            # Yoksa oluştur
-            create_response = requests.post(f'{self.WORDPRESS_URL}/wp-json/wp/v2/tags', 
-                                           auth=self.WP_AUTH, json={'name': etiket_adi})
-            
-            if create_response.status_code == 201:
-                return create_response.json()['id']
-            
-            return None
+            return self.etiket_onbellegi.coz([etiket_adi])[0]
         except:
             return None
 
 # Global yönetici instance
 yonetici = HaberYoneticisi()
 
+# Arka plan zamanlayıcısı - __main__ içinde başlatılır
+haber_zamanlayici = None
+
+# AI ve WordPress işleri web isteklerini bekletmeden kuyrukta çalışır
+isler = is_kuyrugu.IsKuyrugu(yonetici.config.get('settings', {}).get('job_limits', {'gemini': 2, 'wordpress': 2}))
+
+# Scrape sonrası yeni haberler için toplu AI taslakları (settings.ai_batch_enabled)
+yonetici.isler = isler
+yonetici.toplu_yazici = toplu_ai.TopluYenidenYazici(yonetici, isler, yonetici.config)
+
+def is_yaniti(is_id, bekle):
+    """Kuyruğa alınan işin durumunu döndür; kısa sürede biterse sonucu da içerir"""
+    durum = isler.durum(is_id, bekle=min(float(bekle or 0), 30))
+    return jsonify(durum), 200 if durum['bitti'] else 202
+
+# Render edilmiş sayfalar ve parçalar - anahtarlar haber seti sürümünü içerir
+sayfa_onbellek = sayfa_onbellegi.SayfaOnbellegi()
+
+def haber_listesi_parcasi(filtre, haberler, surum):
+    """Haber listesi parçasını önbellekten al veya render et"""
+    # Bilinmeyen filtreler tüm haberleri gösterir, aynı parçayı paylaşsın
+    gorunum = filtre if filtre in haber_indeksi.FILTRELER else 'Tümü'
+    govde, _ = sayfa_onbellek.al_veya_olustur(
+        ('haber_listesi', gorunum, surum),
+        lambda: render_template('_haber_listesi.html', haberler=haberler)
+    )
+    return Markup(govde)
+
 @app.route('/')
 def ana_sayfa():
     """Ana sayfa - haber listesi"""
     filtre = request.args.get('filtre', 'Tümü')
     
-    # Haberleri filtrele
-    if filtre == "Yeni":
-        haberler = [h for h in yonetici.haberler if h.get('durum') == 'Yeni']
-    elif filtre == "İstanbul":
-        haberler = [h for h in yonetici.haberler if h.get('kaynak') == 'İstanbul']
-    elif filtre == "Güncel":
-        haberler = [h for h in yonetici.haberler if h.get('kaynak') == 'Güncel']
-    elif filtre == "Link":
-        haberler = [h for h in yonetici.haberler if h.get('kaynak') == 'Link']
-    else:
-        haberler = yonetici.haberler
+    # Filtre görünümleri ve sayaçlar indekste hazır tutulur
+    haberler, sayaclar, surum = yonetici.indeks.gorunum_ve_sayaclar(filtre)
     
-    # İstatistikler
-    toplam_haber = len(yonetici.haberler)
-    yeni_haber = len([h for h in yonetici.haberler if h.get('durum') == 'Yeni'])
-    link_haber = len([h for h in yonetici.haberler if h.get('kaynak') == 'Link'])
+    def olustur():
+        return render_template('ana_sayfa.html', 
+                             haber_listesi=haber_listesi_parcasi(filtre, haberler, surum), 
+                             filtre=filtre,
+                             toplam_haber=sayaclar['Tümü'],
+                             yeni_haber=sayaclar['Yeni'],
+                             link_haber=sayaclar['Link'])
     
-    return render_template('ana_sayfa.html', 
-                         haberler=haberler, 
-                         filtre=filtre,
-                         toplam_haber=toplam_haber,
-                         yeni_haber=yeni_haber,
-                         link_haber=link_haber)
+    # Haber seti değişmediyse aynı HTML (veya 304) döner
+    return sayfa_onbellek.yanit(('ana_sayfa', filtre, surum), olustur)
+
+@app.route('/parca/haber-listesi')
+def parca_haber_listesi():
+    """Sadece haber listesi parçası - sayfayı yeniden yüklemeden güncellemek için"""
+    filtre = request.args.get('filtre', 'Tümü')
+    haberler, _, surum = yonetici.indeks.gorunum_ve_sayaclar(filtre)
+    gorunum = filtre if filtre in haber_indeksi.FILTRELER else 'Tümü'
+    # Ana sayfanın kullandığı parça kaydıyla aynı anahtar
+    return sayfa_onbellek.yanit(
+        ('haber_listesi', gorunum, surum),
+        lambda: render_template('_haber_listesi.html', haberler=haberler)
+    )
+
+# Editördeki resim seçicinin sayfa büyüklüğü
+RESIM_SAYFA_ADEDI = yonetici.config.get('settings', {}).get('image_page_size', 48)
 
 @app.route('/haber/<haber_id>')
 def haber_detay(haber_id):
     """Haber detay/editör sayfası"""
-    haber = None
-    for h in yonetici.haberler:
-        if h.get('id') == haber_id:
-            haber = h
-            break
+    surum = yonetici.indeks.surum()
+    haber = yonetici.indeks.bul(haber_id)
     
     if not haber:
         flash('Haber bulunamadı!', 'error')
@@ -820,17 +956,25 @@ def haber_detay(haber_id):
     # Kategorileri yükle
     kategoriler = yonetici.kategorileri_yukle()
     
-    # Resim dosyalarını listele - app.config['UPLOAD_FOLDER'] kullan
-    resim_dosyalari = []
-    if os.path.exists(app.config['UPLOAD_FOLDER']):
-        formatlar = ['.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp']
-        resim_dosyalari = [f for f in os.listdir(app.config['UPLOAD_FOLDER']) 
-                          if os.path.splitext(f)[1].lower() in formatlar]
+    # Klasör dışarıdan değiştiyse katalog artımlı taranır, sürümü değişir
+    katalog = yonetici.resim_katalogu
+    katalog.guncel_tut()
+    
+    def olustur():
+        # İlk sayfa katalogdan; devamı ve arama /api/resimler üzerinden
+        resim_dosyalari = [r['dosya_adi'] for r in katalog.listele(adet=RESIM_SAYFA_ADEDI)['resimler']]
+        if haber.get('resim_dosyasi') and haber['resim_dosyasi'] not in resim_dosyalari:
+            resim_dosyalari.insert(0, haber['resim_dosyasi'])
+        
+        return render_template('haber_detay.html', 
+                             haber=haber, 
+                             kategoriler=kategoriler,
+                             resim_dosyalari=resim_dosyalari,
+                             resim_sayfa_adedi=RESIM_SAYFA_ADEDI,
+                             kucuk_resim_url=yonetici.resimler.kucuk_url,
+                             kucuk_webp_url=yonetici.resimler.kucuk_webp_url)
     
-    return render_template('haber_detay.html', 
-                         haber=haber, 
-                         kategoriler=kategoriler,
-                         resim_dosyalari=resim_dosyalari)
+    return sayfa_onbellek.yanit(('haber_detay', haber_id, surum, katalog.surum, yonetici.kategori_onbellegi.surum), olustur)
 
 # ======= API ENDPOINT'LERİ =======
 
@@ -855,41 +999,37 @@ def api_link_haber_cek():
                 return jsonify({'success': False, 'error': 'Geçerli bir URL bulunamadı. URL https:// ile başlamalıdır.'})
         
         # Haberi çek
+        baslangic = time.perf_counter()
         sonuc = yonetici.link_haber_cek(url)
+        cekme_ms = (time.perf_counter() - baslangic) * 1000
         
         if sonuc['success']:
             haber = sonuc['haber']
             
             # Resim varsa indir
+            resim_baslangic = time.perf_counter()
             resim_dosyasi = None
             if haber.get('resim_url'):
-                resim_dosyasi = yonetici.resim_indir_ve_kaydet(
-                    haber['resim_url'], 
-                    f"link_{haber['id']}"
-                )
+                resim_dosyasi = yonetici.resim_indir_ve_kaydet(haber['resim_url'], haber)
                 if resim_dosyasi:
                     haber['resim_dosyasi'] = resim_dosyasi
+            resim_ms = (time.perf_counter() - resim_baslangic) * 1000
             
-            # Link haberlerine ekle
-            # Aynı URL'den daha önce çekilmiş mi kontrol et
-            mevcut_var = False
-            for mevcut_haber in yonetici.link_haberleri:
-                if mevcut_haber.get('url') == url:
-                    # Güncelle
-                    mevcut_haber.update(haber)
-                    mevcut_var = True
-                    break
-            
-            if not mevcut_var:
-                yonetici.link_haberleri.append(haber)
+            # Sadece bu haberi listeye ekle/güncelle - siteler yeniden çekilmez
+            haber = yonetici.link_haberi_birlestir(haber)
             
-            # Ana haber listesini güncelle
-            yonetici.haberleri_yenile()
+            toplam_ms = (time.perf_counter() - baslangic) * 1000
+            yonetici.link_metrigi_kaydet(toplam_ms)
             
             return jsonify({
                 'success': True,
                 'haber': haber,
-                'message': 'Haber başarıyla çekildi'
+                'message': 'Haber başarıyla çekildi',
+                'sureler': {
+                    'cekme_ms': round(cekme_ms),
+                    'resim_ms': round(resim_ms),
+                    'toplam_ms': round(toplam_ms)
+                }
             })
         else:
             return jsonify(sonuc)
@@ -938,10 +1078,12 @@ def api_haberleri_yenile():
             return jsonify({
                 'success': True, 
                 'message': f'Haberler güncellendi. {yeni_sayisi} yeni haber bulundu.',
-                'toplam_haber': len(yonetici.haberler),
+                'toplam_haber': yonetici.indeks.sayaclar()['Tümü'],
                 'yeni_haber': yeni_sayisi,
-                'link_haber': len([h for h in yonetici.haberler if h.get('kaynak') == 'Link'])
+                'link_haber': yonetici.indeks.sayaclar()['Link']
             })
+        elif yonetici.yenileme_devam_ediyor():
+            return jsonify({'success': False, 'error': 'Haberler şu anda arka planda yenileniyor, lütfen biraz sonra tekrar deneyin'})
         else:
             return jsonify({'success': False, 'error': 'Haberler güncellenemedi'})
             
@@ -972,22 +1114,39 @@ def api_ai_yeniden_yaz():
         haber_id = data.get('haber_id')
         
         # Haberi bul
-        haber = None
-        for h in yonetici.haberler:
-            if h.get('id') == haber_id:
-                haber = h
-                break
+        haber = yonetici.indeks.bul(haber_id)
         
         if not haber:
             return jsonify({'success': False, 'error': 'Haber bulunamadı'})
         
-        # AI ile yeniden yaz
-        sonuc = yonetici.ai_ile_yeniden_yaz(haber)
-        return jsonify(sonuc)
+        # AI ile yeniden yaz - Gemini kuyruğunda (yeniden_olustur: önbelleği atla)
+        is_id = isler.gonder('gemini', 'ai_yeniden_yaz', yonetici.ai_ile_yeniden_yaz, haber,
+                             yeniden_olustur=bool(data.get('yeniden_olustur')))
+        return is_yaniti(is_id, data.get('bekle'))
         
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
 
+@app.route('/api/ai-yeniden-yaz/akis/<haber_id>')
+def api_ai_yeniden_yaz_akis(haber_id):
+    """API: AI ile yeniden yazma - Server-Sent Events ile akış"""
+    haber = yonetici.indeks.bul(haber_id)
+    yeniden_olustur = request.args.get('yeniden_olustur') in ('1', 'true')
+    
+    def olaylar():
+        if not haber:
+            yield f"event: hata\ndata: {json.dumps({'error': 'Haber bulunamadı'})}\n\n"
+            return
+        for olay, veri in yonetici.ai_ile_yeniden_yaz_akis(haber, yeniden_olustur):
+            if olay == 'parca':
+                veri = {'html': veri}
+            elif olay in ('hata', 'mesgul'):
+                veri = {'error': veri}
+            yield f"event: {olay}\ndata: {json.dumps(veri, ensure_ascii=False)}\n\n"
+    
+    return app.response_class(stream_with_context(olaylar()), mimetype='text/event-stream',
+                              headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 @app.route('/api/haberi-yayinla', methods=['POST'])
 def api_haberi_yayinla():
     """API: Haberi yayınla"""
@@ -1013,17 +1172,159 @@ def api_haberi_yayinla():
         if not os.path.exists(resim_yolu):
             return jsonify({'success': False, 'error': 'Seçilen fotoğraf bulunamadı!'})
         
-        # Yayınla
-        sonuc = yonetici.haberi_yayinla(baslik, icerik, etiketler, kategori_id, resim_yolu)
-        return jsonify(sonuc)
+        yonetici.resim_katalogu.kullanildi(resim_dosyasi)
+        
+        # Yayınla - WordPress kuyruğunda
+        # yeniden_yayinla: aynı içerik daha önce yayınlandıysa da yeni yazı oluştur
+        is_id = isler.gonder('wordpress', 'yayinla', yonetici.haberi_yayinla,
+                             baslik, icerik, etiketler, kategori_id, resim_yolu,
+                             zorla=bool(data.get('yeniden_yayinla')))
+        return is_yaniti(is_id, data.get('bekle'))
         
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
 
+@app.route('/api/isler/<is_id>')
+def api_is_durumu(is_id):
+    """API: Kuyruktaki işin durumu/sonucu (bekle=sn ile bitene kadar uzun sorgu)"""
+    durum = isler.durum(is_id, bekle=min(request.args.get('bekle', 0, type=float), 30))
+    if durum is None:
+        return jsonify({'success': False, 'error': 'İş bulunamadı'}), 404
+    return jsonify(durum)
+
+@app.route('/api/isler')
+def api_isler():
+    """API: Arka uç bazında iş kuyruğu istatistikleri"""
+    return jsonify(isler.istatistikler())
+
+@app.route('/api/ai-onbellegi')
+def api_ai_onbellegi():
+    """API: AI sonuç önbelleği ve toplu taslak üretimi istatistikleri"""
+    return jsonify(dict(yonetici.ai_onbellegi.istatistikler(), toplu=yonetici.toplu_yazici.durum()))
+
+@app.route('/api/zamanlayici')
+def api_zamanlayici():
+    """API: Arka plan zamanlayıcısının durumu"""
+    if not haber_zamanlayici:
+        return jsonify({'aktif': False})
+    durum = haber_zamanlayici.durum()
+    durum['aktif'] = True
+    return jsonify(durum)
+
+@app.route('/api/link-metrikleri')
+def api_link_metrikleri():
+    """API: Link'ten haber ekleme süreleri"""
+    m = dict(yonetici.link_metrikleri)
+    m['ortalama_ms'] = round(m['toplam_ms'] / m['adet']) if m['adet'] else 0
+    return jsonify(m)
+
+@app.route('/api/http-istatistikleri')
+def api_http_istatistikleri():
+    """API: Bağlantı havuzu ve HTML ayrıştırma istatistikleri"""
+    istatistikler = yonetici.http.istatistikler()
+    istatistikler['ayristirma'] = html_ayristirici.istatistikler()
+    return jsonify(istatistikler)
+
+@app.route('/api/kategorileri-yenile', methods=['POST'])
+def api_kategorileri_yenile():
+    """API: Kategori önbelleğini geçersiz kıl (bekle=true ise yenilemeyi bekle)"""
+    data = request.get_json(silent=True) or {}
+    if data.get('bekle'):
+        basarili = yonetici.kategori_onbellegi.yenile()
+    else:
+        yonetici.kategori_onbellegi.gecersiz_kil()
+        basarili = True
+    return jsonify({'success': basarili, 'durum': yonetici.kategori_onbellegi.durum()})
+
+@app.route('/api/etiket-onbellegi', methods=['GET', 'POST'])
+def api_etiket_onbellegi():
+    """API: Etiket önbelleği durumu; POST tüm etiket listesini yeniden çeker"""
+    if request.method == 'POST':
+        yonetici.etiket_onbellegi.isit()
+    return jsonify(yonetici.etiket_onbellegi.durum())
+
+@app.route('/api/sayfa-onbellegi')
+def api_sayfa_onbellegi():
+    """API: Render edilmiş sayfa önbelleği istatistikleri"""
+    return jsonify(dict(sayfa_onbellek.istatistikler(), haber_surumu=yonetici.indeks.surum()))
+
+@app.route('/api/resimler')
+def api_resimler():
+    """API: Resim kataloğu - sayfalı ve aranabilir liste"""
+    sonuc = yonetici.resim_katalogu.listele(
+        sayfa=request.args.get('sayfa', 1, type=int),
+        adet=request.args.get('adet', RESIM_SAYFA_ADEDI, type=int),
+        arama=request.args.get('ara', '').strip()
+    )
+    for resim in sonuc['resimler']:
+        resim['kucuk_url'] = yonetici.resimler.kucuk_url(resim['dosya_adi'])
+        resim['kucuk_webp_url'] = yonetici.resimler.kucuk_webp_url(resim['dosya_adi'])
+    return jsonify(sonuc)
+
+@app.route('/api/resimler/tara', methods=['POST'])
+def api_resimler_tara():
+    """API: Resim klasörünü katalogla eşitle"""
+    return jsonify(dict(yonetici.resim_katalogu.tara(), **yonetici.resim_katalogu.istatistikler()))
+
+@app.route('/api/resimler/cop-topla', methods=['POST'])
+def api_resimler_cop_topla():
+    """API: Hiçbir habere bağlı olmayan, yayınlanmamış eski resimleri listele (uygula=true ise sil)"""
+    data = request.get_json(silent=True) or {}
+    haberler = yonetici.haberler + list(yonetici.link_haberleri.values())
+    kullanilanlar = {h.get('resim_dosyasi') for h in haberler if h.get('resim_dosyasi')}
+    # Kaynak haberi hâlâ listede olan resimler yetim sayılmaz
+    haber_idleri = {h.get('id') for h in haberler if h.get('id')}
+    # Yayın kayıtları dosya hash'iyle tutulur; yayınlanmış kapaklar silinmez
+    yayinlananlar = set(yonetici.yayin_hatti.kayitlar['medya'])
+    gun = data.get('gun', yonetici.config.get('settings', {}).get('image_gc_days', 7))
+    return jsonify(yonetici.resim_katalogu.cop_topla(kullanilanlar, yayinlananlar, haber_idleri, gun=gun,
+                                                     uygula=bool(data.get('uygula'))))
+
+@app.route('/api/secici-planlari')
+def api_secici_planlari():
+    """API: Site bazında kazanan liste seçicileri ve isabet oranları"""
+    dosya = yonetici.config.get('settings', {}).get('selector_plan_file', 'secici_plani.json')
+    return jsonify(secici_plani.plan_al(dosya).istatistikler())
+
+# Resim sunumu: değişmez URL'ler bir yıl önbellekte kalır.
+# image_accel_redirect: nginx internal location öneki (ör. "/_resimler/") - dosyayı nginx gönderir
+# image_x_sendfile: Apache/lighttpd için X-Sendfile
+RESIM_ONBELLEK_SN = 365 * 24 * 3600
+RESIM_ACCEL_ONEKI = yonetici.config.get('settings', {}).get('image_accel_redirect', '')
+app.config['USE_X_SENDFILE'] = yonetici.config.get('settings', {}).get('image_x_sendfile', False)
+
 @app.route('/static/images/<filename>')
 def uploaded_file(filename):
-    """Yüklenen resimleri serve et"""
-    return send_from_directory(app.config['UPLOAD_FOLDER'], filename)
+    """Yüklenen resimleri serve et
+    
+    İçerik adresli dosya adları ve geçerli ?v= sürümü taşıyan URL'ler immutable
+    olarak önbelleğe alınır, diğerleri her seferinde ETag ile doğrulanır.
+    Koşullu istekler (304) ve Range (206) send_file tarafından karşılanır.
+    """
+    resimler = yonetici.resimler
+    degismez = resimler.degismez_mi(filename, request.args.get('v'))
+    
+    if RESIM_ACCEL_ONEKI:
+        dosya_yolu = safe_join(app.config['UPLOAD_FOLDER'], filename)
+        if dosya_yolu is None or not os.path.isfile(dosya_yolu):
+            abort(404)
+        # Gövdeyi, ETag ve Range'i nginx üretir
+        response = make_response('')
+        response.headers['X-Accel-Redirect'] = RESIM_ACCEL_ONEKI.rstrip('/') + '/' + quote(filename)
+        response.headers['Content-Type'] = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    else:
+        # İçerik adresli dosyada hash zaten güçlü ETag; diğerlerinde mtime/boyut tabanlı varsayılan
+        etag = os.path.splitext(filename)[0] if resim_hatti.icerik_adresli_mi(filename) else True
+        response = send_from_directory(app.config['UPLOAD_FOLDER'], filename, etag=etag)
+    
+    if degismez:
+        response.cache_control.no_cache = None
+        response.cache_control.public = True
+        response.cache_control.max_age = RESIM_ONBELLEK_SN
+        response.cache_control.immutable = True
+    else:
+        response.cache_control.no_cache = True
+    return response
 
 @app.route('/api/fotograf-yukle', methods=['POST'])
 def api_fotograf_yukle():
@@ -1038,48 +1339,18 @@ def api_fotograf_yukle():
             return jsonify({'success': False, 'error': 'Dosya seçilmedi'})
         
         if file and allowed_file(file.filename):
-            # Güvenli dosya adı oluştur
-            filename = secure_filename(file.filename)
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_')
-            filename = timestamp + filename
-            
-            # Klasör oluştur
-            os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
-            
-            # Dosyayı kaydet
-            filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-            file.save(filepath)
-            
-            # Resmi optimize et
-            try:
-                with Image.open(filepath) as img:
-                    # RGBA'yı RGB'ye çevir (JPEG için)
-                    if img.mode in ('RGBA', 'LA', 'P'):
-                        background = Image.new('RGB', img.size, (255, 255, 255))
-                        if img.mode == 'P':
-                            img = img.convert('RGBA')
-                        background.paste(img, mask=img.split()[-1] if img.mode == 'RGBA' else None)
-                        img = background
-                    
-                    # Boyutları kontrol et ve küçült
-                    max_size = (1200, 800)
-                    if img.size[0] > max_size[0] or img.size[1] > max_size[1]:
-                        img.thumbnail(max_size, Image.Resampling.LANCZOS)
-                    
-                    # JPEG olarak kaydet
-                    if not filename.lower().endswith('.jpg'):
-                        filename = os.path.splitext(filename)[0] + '.jpg'
-                        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-                    
-                    img.save(filepath, 'JPEG', quality=85, optimize=True)
-                    
-            except Exception as e:
-                print(f"Resim optimize hatası: {e}")
+            # Dosya diske yazılmadan bellekte işlenir; aynı fotoğraf tekrar yüklenirse mevcut dosya döner
+            filename = yonetici.resimler.kaydet(file.read())
+            if not filename:
+                return jsonify({'success': False, 'error': 'Resim işlenemedi'})
+            yonetici.resim_katalogu.ekle(filename, yonetici.indeks.bul(request.form.get('haber_id', '')))
             
             return jsonify({
                 'success': True, 
                 'filename': filename,
-                'url': f'/static/images/{filename}'
+                'url': yonetici.resimler.url(filename),
+                'kucuk_url': yonetici.resimler.kucuk_url(filename),
+                'kucuk_webp_url': yonetici.resimler.kucuk_webp_url(filename)
             })
         
         return jsonify({'success': False, 'error': 'Geçersiz dosya türü'})
@@ -1094,5 +1365,18 @@ if __name__ == '__main__':
     else:
         os.makedirs('static/images', exist_ok=True)
     
+    debug = True
+    
+    # Reloader iki süreç açar; zamanlayıcı sadece uygulamayı çalıştıran süreçte başlar
+    if yonetici.config.get('settings', {}).get('scheduler_enabled', True) and \
+            (not debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true'):
+        haber_zamanlayici = zamanlayici.HaberZamanlayici(yonetici, yonetici.config)
+        haber_zamanlayici.baslat()
+    
+    # Etiket önbelleği ilk yayından önce ısınsın, resim kataloğu klasörle eşitlensin
+    if not debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        yonetici.etiket_onbellegi.arka_planda_isit()
+        yonetici.resim_katalogu.arka_planda_tara()
+    
     # Debug mode'da çalıştır
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    app.run(debug=debug, host='0.0.0.0', port=5000)
@@ -0,0 +1,221 @@
+import hashlib
+import io
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from PIL import Image, features
+
+# Üretilen türevler: 'kapak' ana dosyadır ({hash}.jpg), diğerleri {hash}_{ad}.{uzantı}
+VARSAYILAN_TURLER = {
+    'kapak': {'boyut': [1200, 800], 'bicim': 'JPEG', 'kalite': 85},
+    'liste': {'boyut': [320, 214], 'bicim': 'JPEG', 'kalite': 80},
+    'liste_webp': {'boyut': [320, 214], 'bicim': 'WEBP', 'kalite': 80},
+}
+
+UZANTILAR = {'JPEG': 'jpg', 'WEBP': 'webp', 'AVIF': 'avif', 'PNG': 'png'}
+
+# Hattın ürettiği dosya adları kaynak içeriğin hash'idir; bir ada yazılan içerik değişmez
+ICERIK_ADRESLI = re.compile(r'[0-9a-f]{20}(_\w+)?\.\w+')
+
+def icerik_adresli_mi(dosya_adi):
+    return bool(ICERIK_ADRESLI.fullmatch(dosya_adi))
+
+def turev_adi(dosya_adi, ad, bicim):
+    """Kapak dosya adından türev dosya adını üret"""
+    if ad == 'kapak':
+        return dosya_adi
+    return f"{os.path.splitext(dosya_adi)[0]}_{ad}.{UZANTILAR.get(bicim, 'jpg')}"
+
+def resmi_isle(veri, turler):
+    """Resmi bellekte bir kez çöz, her tür için küçült ve kodla
+
+    Süreç havuzunda çalışır; girdi bayt dizisi, çıktı {tür adı: bayt} sözlüğüdür.
+    turler: [(ad, (genişlik, yükseklik), biçim, kalite), ...]
+    """
+    en_buyuk = (max(t[1][0] for t in turler), max(t[1][1] for t in turler))
+
+    with Image.open(io.BytesIO(veri)) as img:
+        # JPEG'i doğrudan hedefe yakın çözünürlükte çöz (1/2, 1/4, 1/8 ölçekli DCT)
+        if img.format == 'JPEG':
+            img.draft('RGB', en_buyuk)
+
+        # RGBA'yı RGB'ye çevir (JPEG için)
+        if img.mode in ('RGBA', 'LA', 'P'):
+            background = Image.new('RGB', img.size, (255, 255, 255))
+            if img.mode == 'P':
+                img = img.convert('RGBA')
+            background.paste(img, mask=img.split()[-1] if img.mode in ('RGBA', 'LA') else None)
+            img = background
+        elif img.mode != 'RGB':
+            img = img.convert('RGB')
+
+        # Büyükten küçüğe: her tür bir öncekinin küçültülmüş halinden üretilir
+        ciktilar = {}
+        kaynak = img
+        for ad, boyut, bicim, kalite in sorted(turler, key=lambda t: t[1][0] * t[1][1], reverse=True):
+            if kaynak.size[0] > boyut[0] or kaynak.size[1] > boyut[1]:
+                kaynak = kaynak.copy()
+                kaynak.thumbnail(boyut, Image.Resampling.LANCZOS)
+
+            cikti = io.BytesIO()
+            if bicim == 'JPEG':
+                kaynak.save(cikti, bicim, quality=kalite, optimize=True)
+            else:
+                kaynak.save(cikti, bicim, quality=kalite)
+            ciktilar[ad] = cikti.getvalue()
+        return ciktilar
+
+class ResimHatti:
+    """İndirilen ve yüklenen resimler için ortak işleme hattı
+
+    Çözme/kodlama süreç havuzunda, bellekteki bayt dizisi üzerinden yapılır;
+    tek çözümlemeden ayarlardaki tüm türevler (kapak, liste küçüğü, WebP/AVIF)
+    üretilir. Dosya adı girdi içeriğinin hash'idir; aynı fotoğraf ikinci kez
+    geldiğinde işlenmez, var olan dosya döndürülür.
+    """
+
+    def __init__(self, klasor, max_workers=2, turler=None, url_oneki='/static/images/'):
+        self.klasor = klasor
+        self.url_oneki = url_oneki
+        self.max_workers = max_workers
+        self.turler = self._turleri_hazirla(turler or VARSAYILAN_TURLER)
+        self._kilit = threading.Lock()
+        self._havuz = None
+        self._islenenler = {}  # hash -> Event (aynı resim eşzamanlı gelirse tek işlem)
+        self.istatistik = {'islenen': 0, 'tekrar': 0, 'hata': 0}
+
+    @staticmethod
+    def _turleri_hazirla(turler):
+        hazir = {}
+        for ad, tur in turler.items():
+            bicim = tur.get('bicim', 'JPEG').upper()
+            # AVIF/WebP desteği Pillow derlemesine bağlı; desteklenmeyen türü atla
+            if bicim in ('WEBP', 'AVIF') and not features.check(bicim.lower()):
+                print(f"⚠️ Pillow {bicim} desteklemiyor, '{ad}' türevi üretilmeyecek")
+                continue
+            hazir[ad] = (tuple(tur.get('boyut', (1200, 800))), bicim, tur.get('kalite', 85))
+        hazir.setdefault('kapak', (tuple(VARSAYILAN_TURLER['kapak']['boyut']), 'JPEG',
+                                   VARSAYILAN_TURLER['kapak']['kalite']))
+        return hazir
+
+    def turev(self, dosya_adi, ad='liste'):
+        """Türev dosya adını döndür; türev yoksa (eski dosyalar) kapak dosyasını"""
+        if not dosya_adi or ad not in self.turler:
+            return dosya_adi
+        adi = turev_adi(dosya_adi, ad, self.turler[ad][1])
+        return adi if os.path.exists(os.path.join(self.klasor, adi)) else dosya_adi
+
+    def surum_etiketi(self, dosya_adi):
+        """İçerik adresli olmayan (eski) dosyalar için URL sürümü: mtime ve boyut"""
+        try:
+            st = os.stat(os.path.join(self.klasor, dosya_adi))
+        except OSError:
+            return None
+        return f"{st.st_mtime_ns:x}{st.st_size:x}"
+
+    def url(self, dosya_adi, ad='kapak'):
+        """Resmin değişmez URL'si; eski dosya adlarına ?v= sürümü eklenir"""
+        adi = self.turev(dosya_adi, ad)
+        if not adi or icerik_adresli_mi(adi):
+            return f"{self.url_oneki}{adi or ''}"
+        surum = self.surum_etiketi(adi)
+        return f"{self.url_oneki}{adi}?v={surum}" if surum else f"{self.url_oneki}{adi}"
+
+    def kucuk_url(self, dosya_adi):
+        return self.url(dosya_adi, 'liste')
+
+    def kucuk_webp_url(self, dosya_adi):
+        """Küçük resmin WebP türevinin URL'si; türev yoksa None (<picture> kaynağı için)"""
+        if not dosya_adi or 'liste_webp' not in self.turler:
+            return None
+        adi = turev_adi(dosya_adi, 'liste_webp', self.turler['liste_webp'][1])
+        if not os.path.exists(os.path.join(self.klasor, adi)):
+            return None
+        return self.url(dosya_adi, 'liste_webp')
+
+    def degismez_mi(self, dosya_adi, surum=None):
+        """URL içeriği asla değişmeyecek mi (uzun süreli tarayıcı önbelleği için)"""
+        return icerik_adresli_mi(dosya_adi) or (surum is not None and surum == self.surum_etiketi(dosya_adi))
+
+    def turev_dosyalari(self, dosya_adi):
+        """Kapağın tüm türev dosya adları (kapak hariç)"""
+        return [turev_adi(dosya_adi, ad, bicim) for ad, (_, bicim, _) in self.turler.items() if ad != 'kapak']
+
+    def turev_mi(self, dosya_adi):
+        """Dosya bir kapağın türevi mi (resim seçicide listelenmez)"""
+        govde, uzanti = os.path.splitext(dosya_adi)
+        return any(ad != 'kapak' and govde.endswith(f'_{ad}') and
+                   uzanti[1:].lower() == UZANTILAR.get(bicim, 'jpg')
+                   for ad, (_, bicim, _) in self.turler.items())
+
+    def _havuz_al(self):
+        with self._kilit:
+            if self._havuz is None:
+                if multiprocessing.get_start_method() == 'fork':
+                    self._havuz = ProcessPoolExecutor(max_workers=self.max_workers)
+                else:
+                    # spawn (Windows, macOS) işçileri main.py'yi yeniden import eder ve
+                    # modül düzeyindeki yönetici/kuyruk nesnelerini kurar; thread havuzu kullan
+                    self._havuz = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                     thread_name_prefix='resim')
+            return self._havuz
+
+    def _isle(self, veri, turler):
+        try:
+            return self._havuz_al().submit(resmi_isle, veri, turler).result()
+        except BrokenProcessPool:
+            # Havuz çöktüyse yenisini kur, bu resmi aynı süreçte işle
+            with self._kilit:
+                self._havuz = None
+            return resmi_isle(veri, turler)
+
+    def _eksik_turler(self, dosya_adi):
+        return [(ad, boyut, bicim, kalite) for ad, (boyut, bicim, kalite) in self.turler.items()
+                if not os.path.exists(os.path.join(self.klasor, turev_adi(dosya_adi, ad, bicim)))]
+
+    def kaydet(self, veri):
+        """Resim baytlarını işle ve tüm türevleri kaydet; kapak dosya adını döndür (resim değilse None)"""
+        hash_degeri = hashlib.sha1(veri).hexdigest()
+        dosya_adi = f"{hash_degeri[:20]}.jpg"
+
+        with self._kilit:
+            eksikler = self._eksik_turler(dosya_adi)
+            if not eksikler:
+                self.istatistik['tekrar'] += 1
+                return dosya_adi
+            olay = self._islenenler.get(hash_degeri)
+            if olay is None:
+                self._islenenler[hash_degeri] = threading.Event()
+
+        if olay is not None:
+            # Aynı resim şu anda başka bir istekte işleniyor
+            olay.wait(60)
+            if os.path.exists(os.path.join(self.klasor, dosya_adi)):
+                self.istatistik['tekrar'] += 1
+                return dosya_adi
+            return None
+
+        try:
+            # Sadece eksik türler üretilir (ayarlara sonradan eklenen türler dahil)
+            ciktilar = self._isle(veri, eksikler)
+            os.makedirs(self.klasor, exist_ok=True)
+            # Kapak en son yazılır: kapak varsa türevler de hazırdır
+            for ad, _, bicim, _ in sorted(eksikler, key=lambda t: t[0] == 'kapak'):
+                dosya_yolu = os.path.join(self.klasor, turev_adi(dosya_adi, ad, bicim))
+                gecici = dosya_yolu + '.tmp'
+                with open(gecici, 'wb') as f:
+                    f.write(ciktilar[ad])
+                os.replace(gecici, dosya_yolu)
+            self.istatistik['islenen'] += 1
+            return dosya_adi
+        except Exception as e:
+            self.istatistik['hata'] += 1
+            print(f"Resim işleme hatası: {e}")
+            return None
+        finally:
+            with self._kilit:
+                self._islenenler.pop(hash_degeri).set()
@@ -0,0 +1,257 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+from PIL import Image
+
+import resim_hatti
+
+FORMATLAR = ('.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp')
+
+def _dosya_hash(dosya_yolu):
+    h = hashlib.sha1()
+    with open(dosya_yolu, 'rb') as f:
+        for parca in iter(lambda: f.read(1024 * 1024), b''):
+            h.update(parca)
+    return h.hexdigest()
+
+class ResimKatalogu:
+    """Resim klasörü için kalıcı katalog (SQLite, WAL)
+
+    Her kapak dosyası için boyutlar, hash, dosya boyutu, kaynak haber ve
+    zamanlar saklanır. Editör klasörü taramak yerine katalogdan sayfalı ve
+    aranabilir liste alır. Klasörün mtime'ı değişince sadece yeni/değişen
+    dosyalar okunur; hiçbir habere bağlı olmayan ve hiç yayınlanmamış eski
+    dosyalar cop_topla() ile türevleriyle birlikte silinir.
+    """
+
+    def __init__(self, resimler, dosya='resim_katalogu.db'):
+        self.resimler = resimler  # ResimHatti: klasör ve türev dosya adları
+        self.klasor = resimler.klasor
+        self.dosya = dosya
+        self._kilit = threading.Lock()
+        self._tarama_kilidi = threading.Lock()
+        self._klasor_mtime = None
+        self.surum = 0
+
+        self.conn = sqlite3.connect(dosya, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS resimler (
+                dosya_adi TEXT PRIMARY KEY,
+                hash TEXT,
+                genislik INTEGER,
+                yukseklik INTEGER,
+                boyut INTEGER,
+                mtime REAL,
+                kaynak_haber TEXT,
+                kaynak_baslik TEXT,
+                kaynak_url TEXT,
+                olusturma REAL,
+                son_kullanim REAL
+            );
+            CREATE INDEX IF NOT EXISTS resimler_olusturma ON resimler(olusturma);
+            CREATE INDEX IF NOT EXISTS resimler_kaynak ON resimler(kaynak_haber);
+        ''')
+        self.conn.commit()
+
+    def __len__(self):
+        with self._kilit:
+            return self.conn.execute('SELECT COUNT(*) FROM resimler').fetchone()[0]
+
+    def _katalogluk_mu(self, dosya_adi):
+        return (os.path.splitext(dosya_adi)[1].lower() in FORMATLAR
+                and not self.resimler.turev_mi(dosya_adi))
+
+    def _bilgi(self, dosya_adi, st):
+        """Dosyanın katalog satırı için hash ve boyutlarını oku (resim değilse None)"""
+        dosya_yolu = os.path.join(self.klasor, dosya_adi)
+        try:
+            with Image.open(dosya_yolu) as img:  # Sadece başlık okunur
+                genislik, yukseklik = img.size
+            return (_dosya_hash(dosya_yolu), genislik, yukseklik, st.st_size, st.st_mtime)
+        except Exception as e:
+            print(f"⚠️ Resim kataloğa eklenemedi ({dosya_adi}): {e}")
+            return None
+
+    def ekle(self, dosya_adi, haber=None, kaynak_url=None):
+        """Kaydedilen resmi kataloğa ekle/güncelle; kaynak haber bilgisi varsa yaz"""
+        try:
+            st = os.stat(os.path.join(self.klasor, dosya_adi))
+        except OSError:
+            return False
+        bilgi = self._bilgi(dosya_adi, st)
+        if bilgi is None:
+            return False
+
+        haber = haber or {}
+        simdi = time.time()
+        with self._kilit:
+            self.conn.execute('''
+                INSERT INTO resimler (dosya_adi, hash, genislik, yukseklik, boyut, mtime,
+                                      kaynak_haber, kaynak_baslik, kaynak_url, olusturma, son_kullanim)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(dosya_adi) DO UPDATE SET
+                    hash = excluded.hash, genislik = excluded.genislik, yukseklik = excluded.yukseklik,
+                    boyut = excluded.boyut, mtime = excluded.mtime,
+                    kaynak_haber = COALESCE(excluded.kaynak_haber, kaynak_haber),
+                    kaynak_baslik = COALESCE(excluded.kaynak_baslik, kaynak_baslik),
+                    kaynak_url = COALESCE(excluded.kaynak_url, kaynak_url),
+                    son_kullanim = excluded.son_kullanim
+            ''', (dosya_adi, *bilgi, haber.get('id'), haber.get('baslik'), kaynak_url, simdi, simdi))
+            self.conn.commit()
+            self.surum += 1
+        return True
+
+    def kullanildi(self, dosya_adi):
+        """Resim bir yayında kullanıldı (çöp toplamada son kullanım zamanı)"""
+        with self._kilit:
+            self.conn.execute('UPDATE resimler SET son_kullanim = ? WHERE dosya_adi = ?',
+                              (time.time(), dosya_adi))
+            self.conn.commit()
+
+    # ======= TARAMA =======
+
+    def tara(self):
+        """Klasörü katalogla eşitle: yeni/değişen dosyaları oku, silinenleri çıkar"""
+        with self._tarama_kilidi:
+            try:
+                # mtime taramadan önce alınır; tarama sırasında eklenen dosya bir sonrakinde görülür
+                klasor_mtime = os.stat(self.klasor).st_mtime_ns
+            except OSError:
+                return {'eklenen': 0, 'guncellenen': 0, 'silinen': 0}
+
+            with self._kilit:
+                kayitli = {dosya_adi: (mtime, boyut) for dosya_adi, mtime, boyut in
+                           self.conn.execute('SELECT dosya_adi, mtime, boyut FROM resimler')}
+
+            simdi = time.time()
+            yeniler, guncellenenler, gorulen = [], [], set()
+            with os.scandir(self.klasor) as girdiler:
+                for girdi in girdiler:
+                    if not girdi.is_file() or not self._katalogluk_mu(girdi.name):
+                        continue
+                    gorulen.add(girdi.name)
+                    st = girdi.stat()
+                    onceki = kayitli.get(girdi.name)
+                    if onceki == (st.st_mtime, st.st_size):
+                        continue
+                    bilgi = self._bilgi(girdi.name, st)
+                    if bilgi:
+                        (guncellenenler if onceki else yeniler).append((girdi.name, bilgi))
+            silinenler = [dosya_adi for dosya_adi in kayitli if dosya_adi not in gorulen]
+
+            with self._kilit:
+                self.conn.executemany('''
+                    INSERT INTO resimler (dosya_adi, hash, genislik, yukseklik, boyut, mtime, olusturma)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(dosya_adi) DO UPDATE SET
+                        hash = excluded.hash, genislik = excluded.genislik, yukseklik = excluded.yukseklik,
+                        boyut = excluded.boyut, mtime = excluded.mtime
+                ''', [(dosya_adi, *bilgi, simdi) for dosya_adi, bilgi in yeniler + guncellenenler])
+                self.conn.executemany('DELETE FROM resimler WHERE dosya_adi = ?',
+                                      [(dosya_adi,) for dosya_adi in silinenler])
+                self.conn.commit()
+                if yeniler or guncellenenler or silinenler:
+                    self.surum += 1
+                self._klasor_mtime = klasor_mtime
+
+            sonuc = {'eklenen': len(yeniler), 'guncellenen': len(guncellenenler), 'silinen': len(silinenler)}
+            if any(sonuc.values()):
+                print(f"🖼️ Resim kataloğu güncellendi: {sonuc}")
+            return sonuc
+
+    def arka_planda_tara(self):
+        threading.Thread(target=self.tara, daemon=True, name='resim-katalogu').start()
+
+    def guncel_tut(self):
+        """Klasör dışarıdan değiştiyse artımlı tara (tarama sürüyorsa bekleme)"""
+        try:
+            klasor_mtime = os.stat(self.klasor).st_mtime_ns
+        except OSError:
+            return
+        if klasor_mtime != self._klasor_mtime and not self._tarama_kilidi.locked():
+            self.tara()
+
+    # ======= SORGULAR =======
+
+    def listele(self, sayfa=1, adet=48, arama=''):
+        """Yeniden eskiye sayfalı liste; arama dosya adı ve kaynak başlıkta yapılır"""
+        self.guncel_tut()
+        sayfa, adet = max(1, int(sayfa)), min(max(1, int(adet)), 200)
+
+        kosul, parametreler = '', []
+        if arama:
+            kosul = 'WHERE dosya_adi LIKE ? OR kaynak_baslik LIKE ?'
+            parametreler = [f'%{arama}%', f'%{arama}%']
+
+        with self._kilit:
+            toplam = self.conn.execute(f'SELECT COUNT(*) FROM resimler {kosul}', parametreler).fetchone()[0]
+            imlec = self.conn.execute(f'''
+                SELECT dosya_adi, hash, genislik, yukseklik, boyut, kaynak_haber, kaynak_baslik,
+                       kaynak_url, olusturma, son_kullanim
+                FROM resimler {kosul} ORDER BY olusturma DESC, dosya_adi LIMIT ? OFFSET ?
+            ''', parametreler + [adet, (sayfa - 1) * adet])
+            alanlar = [sutun[0] for sutun in imlec.description]
+            resimler = [dict(zip(alanlar, satir)) for satir in imlec.fetchall()]
+
+        return {'resimler': resimler, 'toplam': toplam, 'sayfa': sayfa, 'adet': adet,
+                'devami_var': sayfa * adet < toplam}
+
+    def bul(self, dosya_adi):
+        with self._kilit:
+            imlec = self.conn.execute('SELECT * FROM resimler WHERE dosya_adi = ?', (dosya_adi,))
+            satir = imlec.fetchone()
+            return dict(zip([sutun[0] for sutun in imlec.description], satir)) if satir else None
+
+    # ======= ÇÖP TOPLAMA =======
+
+    def cop_topla(self, kullanilanlar, yayinlanan_hashler=(), haber_idleri=(), gun=7, uygula=False):
+        """Kullanılmayan ve gun süresince dokunulmamış resimleri bul/sil
+
+        Kullanımda sayılanlar: kaynak haberi hâlâ haber_idleri'nde olanlar
+        (link haberleri, editörden yüklenenler), kullanilanlar'daki dosya
+        adları (bellekteki haberler) ve hash'i yayinlanan_hashler'de olanlar
+        (WordPress'e yüklenmiş medya). Resim hattının üretmediği (içerik adresli olmayan)
+        eski kütüphane dosyalarına dokunulmaz. Taramada bulunan dosyaların
+        zamanı kataloğa eklendikleri andır, dosya mtime'ı değil. uygula=False
+        ise sadece silinecekler listelenir.
+        """
+        self.guncel_tut()
+        sinir = time.time() - gun * 86400
+        with self._kilit:
+            adaylar = [(dosya_adi, boyut) for dosya_adi, boyut, hash_degeri, kaynak_haber in self.conn.execute('''
+                SELECT dosya_adi, boyut, hash, kaynak_haber FROM resimler
+                WHERE MAX(olusturma, COALESCE(son_kullanim, 0)) < ?
+            ''', (sinir,)) if resim_hatti.icerik_adresli_mi(dosya_adi)
+                and dosya_adi not in kullanilanlar and hash_degeri not in yayinlanan_hashler
+                and kaynak_haber not in haber_idleri]
+
+        silinenler, bosaltilan = [], 0
+        for dosya_adi, boyut in adaylar:
+            bosaltilan += boyut or 0
+            if uygula:
+                for adi in [dosya_adi] + self.resimler.turev_dosyalari(dosya_adi):
+                    try:
+                        os.remove(os.path.join(self.klasor, adi))
+                    except FileNotFoundError:
+                        pass
+            silinenler.append(dosya_adi)
+
+        if uygula and silinenler:
+            with self._kilit:
+                self.conn.executemany('DELETE FROM resimler WHERE dosya_adi = ?',
+                                      [(dosya_adi,) for dosya_adi in silinenler])
+                self.conn.commit()
+                self.surum += 1
+            print(f"🗑️ {len(silinenler)} kullanılmayan resim silindi ({bosaltilan // 1024} KB)")
+
+        return {'uygulandi': uygula, 'adet': len(silinenler), 'bayt': bosaltilan, 'dosyalar': silinenler}
+
+    def istatistikler(self):
+        with self._kilit:
+            adet, toplam = self.conn.execute('SELECT COUNT(*), COALESCE(SUM(boyut), 0) FROM resimler').fetchone()
+        return {'adet': adet, 'toplam_bayt': toplam, 'surum': self.surum}
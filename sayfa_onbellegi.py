@@ -0,0 +1,63 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+from flask import make_response, request
+
+class SayfaOnbellegi:
+    """Render edilmiş sayfa ve parçalar için LRU önbellek
+
+    Anahtarlar filtreyi ve haber setinin sürüm numarasını içerir; haber seti
+    değişince yeni anahtarlar oluşur, eski kayıtlar LRU ile düşer. Her kayıt
+    gövdenin hash'inden üretilen güçlü bir ETag ile saklanır.
+    """
+
+    def __init__(self, max_kayit=128):
+        self.max_kayit = max_kayit
+        self._kilit = threading.Lock()
+        self._kayitlar = OrderedDict()  # anahtar -> (govde, etag)
+        self.istatistik = {'isabet': 0, 'iskalama': 0, '304': 0}
+
+    def al_veya_olustur(self, anahtar, olustur):
+        """Kayıt varsa döndür, yoksa olustur() ile render edip sakla"""
+        with self._kilit:
+            kayit = self._kayitlar.get(anahtar)
+            if kayit is not None:
+                self._kayitlar.move_to_end(anahtar)
+                self.istatistik['isabet'] += 1
+                return kayit
+
+        # Render kilit dışında; aynı anahtar iki kez render edilse de sonuç aynıdır
+        govde = olustur()
+        kayit = (govde, hashlib.md5(govde.encode('utf-8')).hexdigest())
+
+        with self._kilit:
+            self.istatistik['iskalama'] += 1
+            self._kayitlar[anahtar] = kayit
+            self._kayitlar.move_to_end(anahtar)
+            while len(self._kayitlar) > self.max_kayit:
+                self._kayitlar.popitem(last=False)
+        return kayit
+
+    def yanit(self, anahtar, olustur):
+        """Önbellekten ETag'li yanıt üret; tarayıcıdaki sürüm aynıysa 304 döndür"""
+        govde, etag = self.al_veya_olustur(anahtar, olustur)
+
+        response = make_response(govde)
+        response.set_etag(etag)
+        # Tarayıcı saklar ama her seferinde ETag ile doğrular
+        response.headers['Cache-Control'] = 'no-cache'
+        response.make_conditional(request)
+
+        if response.status_code == 304:
+            with self._kilit:
+                self.istatistik['304'] += 1
+        return response
+
+    def temizle(self):
+        with self._kilit:
+            self._kayitlar.clear()
+
+    def istatistikler(self):
+        with self._kilit:
+            return dict(self.istatistik, kayit=len(self._kayitlar))
@@ -0,0 +1,108 @@
+import json
+import os
+import threading
+from datetime import datetime
+
+class SeciciPlani:
+    """Site başına kazanan liste seçicisini öğrenen ve diskte saklayan plan
+
+    Kazanan seçici sonraki döngülerde ilk sırada denenir; sadece artık
+    eşleşmediğinde diğer seçicilere dönülür ve yeniden öğrenilir.
+    Dosya kazanan değişince hemen, sayaçlar için döngü sonunda (kaydet)
+    yazılır.
+    """
+
+    def __init__(self, dosya='secici_plani.json'):
+        self.dosya = dosya
+        self._kilit = threading.Lock()
+        self._kirli = False  # Diske yazılmamış sayaç değişikliği var
+        self.siteler = self._yukle()
+
+    def _yukle(self):
+        if os.path.exists(self.dosya):
+            try:
+                with open(self.dosya, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except:
+                return {}
+        return {}
+
+    def _diske_yaz(self):
+        # Kilit altında çağrılır
+        try:
+            gecici = self.dosya + '.tmp'
+            with open(gecici, 'w', encoding='utf-8') as f:
+                json.dump(self.siteler, f, ensure_ascii=False, indent=2)
+            os.replace(gecici, self.dosya)
+            self._kirli = False
+        except Exception as e:
+            print(f"❌ Seçici planı yazma hatası: {e}")
+
+    def sirali_seciciler(self, site, seciciler):
+        """Kazanan seçici önde olacak şekilde seçici listesini döndür"""
+        with self._kilit:
+            kazanan = self.siteler.get(site, {}).get('kazanan')
+
+        if kazanan in seciciler:
+            return [kazanan] + [s for s in seciciler if s != kazanan]
+        return list(seciciler)
+
+    def sonuc_kaydet(self, site, secici):
+        """Bu sayfada kazanan seçiciyi kaydet (hiçbiri eşleşmediyse None)"""
+        with self._kilit:
+            plan = self.siteler.setdefault(site, {
+                'kazanan': None, 'deneme': 0, 'isabet': 0,
+                'yeniden_ogrenme': 0, 'bos': 0, 'seciciler': {}
+            })
+            plan['deneme'] += 1
+            kazanan_degisti = False
+
+            if secici is None:
+                plan['bos'] += 1
+            elif secici == plan['kazanan']:
+                plan['isabet'] += 1
+            else:
+                if plan['kazanan'] is not None:
+                    plan['yeniden_ogrenme'] += 1
+                    print(f"🔁 {site}: seçici değişti {plan['kazanan']} → {secici}")
+                plan['kazanan'] = secici
+                plan['ogrenme_zamani'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                kazanan_degisti = True
+
+            if secici is not None:
+                plan['seciciler'][secici] = plan['seciciler'].get(secici, 0) + 1
+
+            self._kirli = True
+            if kazanan_degisti:
+                self._diske_yaz()
+
+    def kaydet(self):
+        """Bekleyen sayaç değişikliklerini diske yaz (scrape döngüsü sonunda)"""
+        with self._kilit:
+            if self._kirli:
+                self._diske_yaz()
+
+    def istatistikler(self):
+        """Site bazında kazanan seçici ve isabet oranı"""
+        with self._kilit:
+            return {
+                site: {
+                    'kazanan': plan['kazanan'],
+                    'deneme': plan['deneme'],
+                    'isabet_orani': round(plan['isabet'] / plan['deneme'], 3) if plan['deneme'] else 0,
+                    'yeniden_ogrenme': plan['yeniden_ogrenme'],
+                    'bos': plan['bos'],
+                    'seciciler': dict(plan['seciciler'])
+                }
+                for site, plan in self.siteler.items()
+            }
+
+_planlar = {}
+_plan_kilidi = threading.Lock()
+
+def plan_al(dosya='secici_plani.json'):
+    """Dosya başına tek plan örneği döndür (scraper örnekleri arasında paylaşılır)"""
+    with _plan_kilidi:
+        if dosya not in _planlar:
+            _planlar[dosya] = SeciciPlani(dosya)
+        return _planlar[dosya]
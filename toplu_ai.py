@@ -0,0 +1,236 @@
+import json
+import os
+import threading
+import time
+from datetime import date
+
+import haber_kaynaklari
+
+class TokenKovasi:
+    """Dakikada belirli sayıda isteğe izin veren token kovası
+
+    Gemini 429 döndürdüğünde duraklat() ile kova bir süre boşaltılır.
+    """
+
+    def __init__(self, dakikada=10, kapasite=None):
+        self.hiz = dakikada / 60.0
+        self.kapasite = kapasite or max(1, dakikada)
+        self._tokenler = float(self.kapasite)
+        self._son = time.monotonic()
+        self._bekle_kadar = 0
+        self._kilit = threading.Lock()
+
+    def _bekleme(self, simdi):
+        # Kilit altında çağrılır: tokenleri doldur, bir sonraki token için kalan süre
+        self._tokenler = min(self.kapasite, self._tokenler + (simdi - self._son) * self.hiz)
+        self._son = simdi
+        if simdi >= self._bekle_kadar and self._tokenler >= 1:
+            return 0
+        return max(self._bekle_kadar - simdi, (1 - self._tokenler) / self.hiz)
+
+    def al(self, zaman_asimi=300):
+        """Token alınana kadar en fazla zaman_asimi saniye bekle; alınamazsa False"""
+        bitis = time.monotonic() + zaman_asimi
+        while True:
+            with self._kilit:
+                simdi = time.monotonic()
+                bekleme = self._bekleme(simdi)
+                if not bekleme:
+                    self._tokenler -= 1
+                    return True
+
+            kalan = bitis - time.monotonic()
+            if kalan <= 0:
+                return False
+            time.sleep(min(bekleme, kalan))
+
+    def bekleme_suresi(self):
+        """Bir sonraki tokenin hazır olmasına kalan saniye"""
+        with self._kilit:
+            return self._bekleme(time.monotonic())
+
+    def duraklat(self, saniye=60):
+        with self._kilit:
+            self._bekle_kadar = max(self._bekle_kadar, time.monotonic() + saniye)
+            self._tokenler = 0
+
+class GunlukKota:
+    """Günlük AI çağrı sınırı (gün değişince sıfırlanır, diskte saklanır)"""
+
+    def __init__(self, limit=200, dosya='ai_kota.json'):
+        self.limit = limit
+        self.dosya = dosya
+        self._kilit = threading.Lock()
+        self.tarih = date.today().isoformat()
+        self.kullanilan = 0
+        self._yukle()
+
+    def _yukle(self):
+        if not self.dosya or not os.path.exists(self.dosya):
+            return
+        try:
+            with open(self.dosya, 'r', encoding='utf-8') as f:
+                veri = json.load(f)
+            if veri.get('tarih') == self.tarih:
+                self.kullanilan = veri.get('kullanilan', 0)
+        except Exception as e:
+            print(f"❌ AI kota dosyası okunamadı: {e}")
+
+    def _kaydet(self):
+        if not self.dosya:
+            return
+        try:
+            gecici = self.dosya + '.tmp'
+            with open(gecici, 'w', encoding='utf-8') as f:
+                json.dump({'tarih': self.tarih, 'kullanilan': self.kullanilan}, f)
+            os.replace(gecici, self.dosya)
+        except Exception as e:
+            print(f"❌ AI kota dosyası yazma hatası: {e}")
+
+    def ayir(self):
+        """Kotadan bir çağrı ayır; kota dolduysa False"""
+        with self._kilit:
+            bugun = date.today().isoformat()
+            if bugun != self.tarih:
+                self.tarih, self.kullanilan = bugun, 0
+            if self.kullanilan >= self.limit:
+                return False
+            self.kullanilan += 1
+            self._kaydet()
+            return True
+
+    def kalan(self):
+        with self._kilit:
+            if date.today().isoformat() != self.tarih:
+                return self.limit
+            return max(0, self.limit - self.kullanilan)
+
+class TopluYenidenYazici:
+    """Her scrape döngüsünden sonra yeni haberlerin AI taslaklarını arka planda üretir
+
+    settings.ai_batch_enabled açıksa, durumu 'Yeni' olan ve taslağı olmayan
+    haberler öncelik sırasına göre (ilk ai_batch_top_n tanesi) iş kuyruğunun
+    ayrı 'gemini_toplu' arka ucuna alınır. Gemini çağrıları token kovası ve
+    günlük kota ile sınırlanır; önbellekten gelen sonuçlar kotayı harcamaz.
+    Sonuç haberin 'ai_taslak' alanına yazılır, editör açıldığında hazırdır.
+    """
+
+    ARKA_UC = 'gemini_toplu'
+
+    def __init__(self, yonetici, isler, config):
+        self.yonetici = yonetici
+        self.isler = isler
+        settings = (config or {}).get('settings', {})
+
+        self.etkin = settings.get('ai_batch_enabled', False)
+        self.ilk_n = settings.get('ai_batch_top_n', 10)  # 0: tüm yeni haberler
+        self.kova = TokenKovasi(settings.get('ai_batch_rpm', 10))
+        # Token için en fazla bu kadar beklenir; işçi dakikalarca kilitlenmez,
+        # haber bir sonraki scrape döngüsünde tekrar kuyruğa alınır
+        self.kova_bekleme = settings.get('ai_batch_rate_wait', 5)
+        self.kota = GunlukKota(settings.get('ai_daily_quota', 200),
+                               settings.get('ai_quota_file', 'ai_kota.json'))
+        self.isler.limitler.setdefault(self.ARKA_UC, settings.get('ai_batch_concurrency', 1))
+
+        self._kilit = threading.Lock()
+        self._bekleyenler = set()  # Kuyruktaki haber ID'leri (aynı haber iki kez alınmasın)
+        self._denemeler = {}  # Hız sınırı yüzünden ertelenen haber ID'si -> deneme sayısı
+        self.max_erteleme = settings.get('ai_batch_max_retries', 5)
+        self.istatistik = {'kuyruga_alinan': 0, 'uretilen': 0, 'onbellekten': 0,
+                           'kota_doldu': 0, 'hiz_siniri': 0, 'ertelenen': 0, 'hata': 0}
+
+    def kuyruga_al(self, haberler):
+        """Taslağı olmayan yeni haberleri öncelik sırasıyla kuyruğa al"""
+        if not self.etkin:
+            return 0
+
+        adaylar = [h for h in haberler
+                   if h.get('durum') == 'Yeni' and not h.get('ai_taslak') and h.get('id')]
+        adaylar = haber_kaynaklari.MultiNewsSource(self.yonetici.config).sort_news_by_priority(adaylar)
+        if self.ilk_n:
+            adaylar = adaylar[:self.ilk_n]
+
+        eklenen = 0
+        for haber in adaylar:
+            with self._kilit:
+                if haber['id'] in self._bekleyenler:
+                    continue
+                self._bekleyenler.add(haber['id'])
+            self.isler.gonder(self.ARKA_UC, 'toplu_ai', self._yaz, haber)
+            eklenen += 1
+
+        self.istatistik['kuyruga_alinan'] += eklenen
+        if eklenen:
+            print(f"🤖 {eklenen} yeni haber toplu AI kuyruğuna alındı (kalan kota: {self.kota.kalan()})")
+        return eklenen
+
+    def _izin(self):
+        """Gemini çağrısından hemen önce: hız sınırı ve günlük kota"""
+        if not self.kota.kalan():
+            self.istatistik['kota_doldu'] += 1
+            return False
+        if not self.kova.al(zaman_asimi=self.kova_bekleme):
+            self.istatistik['hiz_siniri'] += 1
+            return False
+        if not self.kota.ayir():
+            self.istatistik['kota_doldu'] += 1
+            return False
+        return True
+
+    def _yaz(self, haber):
+        ertelendi = False
+        try:
+            sonuc = self.yonetici.ai_ile_yeniden_yaz(haber, izin=self._izin)
+            if sonuc.get('success'):
+                self.istatistik['onbellekten' if sonuc.get('onbellekten') else 'uretilen'] += 1
+                self.yonetici.indeks.alanlari_guncelle(haber['id'], {'ai_taslak': sonuc})
+            elif sonuc.get('izin_yok'):
+                # Günlük kota değil hız sınırıysa token dolunca tekrar dene
+                if self.kota.kalan():
+                    ertelendi = self._ertele(haber)
+            else:
+                hata = sonuc.get('error', '')
+                if '429' in hata or 'ResourceExhausted' in hata or 'quota' in hata.lower():
+                    # Gemini hız sınırı: kovayı bir dakika durdur, haberi sonra tekrar dene
+                    self.istatistik['hiz_siniri'] += 1
+                    self.kova.duraklat(60)
+                    ertelendi = self._ertele(haber)
+                else:
+                    self.istatistik['hata'] += 1
+            return sonuc
+        finally:
+            if not ertelendi:
+                with self._kilit:
+                    self._bekleyenler.discard(haber['id'])
+                    self._denemeler.pop(haber['id'], None)
+
+    def _ertele(self, haber):
+        """Haberi kovanın dolma süresinden sonra tekrar kuyruğa al (haber ID'si bekleyenlerde kalır)"""
+        with self._kilit:
+            deneme = self._denemeler.get(haber['id'], 0) + 1
+            if deneme > self.max_erteleme:
+                return False
+            self._denemeler[haber['id']] = deneme
+            sira = len(self._denemeler)
+        # Aynı anda ertelenenler aynı anda uyanmasın: sıradaki her haber bir token aralığı sonra
+        gecikme = self.kova.bekleme_suresi() + sira / self.kova.hiz
+        zamanlayici = threading.Timer(gecikme, self._tekrar_gonder, args=(haber['id'],))
+        zamanlayici.daemon = True
+        zamanlayici.start()
+        self.istatistik['ertelenen'] += 1
+        return True
+
+    def _tekrar_gonder(self, haber_id):
+        # Haberin güncel hali: listeden düştüyse veya taslağı varsa atla
+        haber = self.yonetici.indeks.bul(haber_id)
+        if haber is None or haber.get('ai_taslak'):
+            with self._kilit:
+                self._bekleyenler.discard(haber_id)
+                self._denemeler.pop(haber_id, None)
+            return
+        self.isler.gonder(self.ARKA_UC, 'toplu_ai', self._yaz, haber)
+
+    def durum(self):
+        return dict(self.istatistik, etkin=self.etkin, ilk_n=self.ilk_n,
+                    kalan_kota=self.kota.kalan(), gunluk_kota=self.kota.limit,
+                    bekleyen=len(self._bekleyenler))
@@ -0,0 +1,307 @@
+import html
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+def tum_sayfalari_cek(http, url, auth=None, params=None, per_page=100, timeout=15):
+    """WordPress REST listesini X-WP-TotalPages başlığına göre sayfa sayfa çek
+
+    Herhangi bir sayfa başarısız olursa None döner (yarım liste önbelleğe yazılmasın).
+    """
+    sonuc = []
+    sayfa = 1
+    toplam_sayfa = 1
+
+    while sayfa <= toplam_sayfa:
+        istek_parametreleri = dict(params or {}, per_page=per_page, page=sayfa)
+        response = http.get(url, auth=auth, params=istek_parametreleri, timeout=timeout)
+        if response.status_code != 200:
+            print(f"❌ {url} sayfa {sayfa}: HTTP {response.status_code}")
+            return None
+
+        sonuc.extend(response.json())
+        try:
+            toplam_sayfa = int(response.headers.get('X-WP-TotalPages', 1))
+        except ValueError:
+            toplam_sayfa = 1
+        sayfa += 1
+
+    return sonuc
+
+class KategoriOnbellegi:
+    """WordPress kategorileri için TTL önbellek (stale-while-revalidate)
+
+    Süresi dolan liste hemen döndürülür ve arka planda yenilenir; editör
+    sayfası WordPress'i beklemez. Liste diske de yazılır, yeniden başlatmada
+    ilk sayfa açılışı da beklemez. WordPress'e ulaşılamazsa eski liste kalır.
+    """
+
+    def __init__(self, yukleyici, dosya='kategoriler.json', ttl=600):
+        self.yukleyici = yukleyici  # Tam kategori listesini döndürür, hata olursa None
+        self.dosya = dosya
+        self.ttl = ttl
+        self._kilit = threading.Lock()
+        self._yenileniyor = False
+        self.kategoriler = None
+        self.zaman = 0
+        self.surum = 0  # Liste her değiştiğinde artar (sayfa önbelleği anahtarı)
+        self.istatistik = {'isabet': 0, 'bayat': 0, 'yenileme': 0, 'hata': 0}
+        self._yukle()
+
+    def _yukle(self):
+        if not self.dosya or not os.path.exists(self.dosya):
+            return
+        try:
+            with open(self.dosya, 'r', encoding='utf-8') as f:
+                veri = json.load(f)
+            self.kategoriler = veri.get('kategoriler')
+            self.zaman = veri.get('zaman', 0)
+        except Exception as e:
+            print(f"❌ Kategori önbelleği okunamadı: {e}")
+
+    def _diske_yaz(self):
+        if not self.dosya:
+            return
+        try:
+            gecici = self.dosya + '.tmp'
+            with open(gecici, 'w', encoding='utf-8') as f:
+                json.dump({'zaman': self.zaman, 'kategoriler': self.kategoriler}, f, ensure_ascii=False)
+            os.replace(gecici, self.dosya)
+        except Exception as e:
+            print(f"❌ Kategori önbelleği yazma hatası: {e}")
+
+    def al(self):
+        """Kategorileri döndür; hiç yoksa bekleyerek, bayatsa arka planda yenile"""
+        if self.kategoriler is None:
+            self.yenile()
+            return self.kategoriler or []
+
+        if time.time() - self.zaman > self.ttl:
+            self.istatistik['bayat'] += 1
+            self._arka_planda_yenile()
+        else:
+            self.istatistik['isabet'] += 1
+        return self.kategoriler
+
+    def _arka_planda_yenile(self):
+        with self._kilit:
+            if self._yenileniyor:
+                return
+            self._yenileniyor = True
+        threading.Thread(target=self.yenile, name='kategori-yenile', daemon=True).start()
+
+    def yenile(self):
+        """WordPress'ten tam listeyi çek (hata olursa eldeki liste korunur)"""
+        with self._kilit:
+            self._yenileniyor = True
+        try:
+            self.istatistik['yenileme'] += 1
+            kategoriler = self.yukleyici()
+            if kategoriler is None:
+                self.istatistik['hata'] += 1
+                return False
+
+            with self._kilit:
+                if kategoriler != self.kategoriler:
+                    self.surum += 1
+                self.kategoriler = kategoriler
+                self.zaman = time.time()
+            self._diske_yaz()
+            return True
+        except Exception as e:
+            self.istatistik['hata'] += 1
+            print(f"❌ Kategori yenileme hatası: {e}")
+            return False
+        finally:
+            with self._kilit:
+                self._yenileniyor = False
+
+    def gecersiz_kil(self):
+        """Listeyi bayat işaretle ve arka planda yenilemeyi başlat"""
+        self.zaman = 0
+        self._arka_planda_yenile()
+
+    def durum(self):
+        return dict(self.istatistik,
+                    adet=len(self.kategoriler or []),
+                    yas_sn=round(time.time() - self.zaman) if self.zaman else None,
+                    ttl=self.ttl,
+                    yenileniyor=self._yenileniyor,
+                    surum=self.surum)
+
+def _etiket_anahtari(ad):
+    # WordPress adları HTML entity'li döndürür (&amp; gibi)
+    return html.unescape(ad or '').strip().lower()
+
+class EtiketOnbellegi:
+    """WordPress etiket adı -> ID için kalıcı, büyük/küçük harf duyarsız önbellek
+
+    Bir kez tüm etiket listesiyle ısıtılır (sayfa sayfa), sonra yayınlamada
+    etiketler genelde ağa çıkmadan çözülür. Önbellekte olmayanlar paralel
+    olarak aranır, yoksa oluşturulur ve önbelleğe eklenir.
+    """
+
+    def __init__(self, http, url, auth=None, dosya='etiketler.json', yenileme_saat=24, max_workers=4):
+        self.http = http
+        self.url = url  # .../wp-json/wp/v2/tags
+        self.auth = auth
+        self.dosya = dosya
+        self.yenileme_saat = yenileme_saat
+        self.max_workers = max_workers
+        self._kilit = threading.Lock()
+        self._yazma_kilidi = threading.Lock()
+        self._isitiliyor = False
+        self._isitma_bitti = threading.Event()
+        self.etiketler = {}  # küçük harfli ad -> id
+        self._isitma_sirasinda = {}  # Isıtma sürerken çözülenler (yeni liste bunları kaybetmesin)
+        self.isitma_zamani = 0
+        self.istatistik = {'isabet': 0, 'iskalama': 0, 'olusturulan': 0, 'hata': 0}
+        self._yukle()
+
+    def _yukle(self):
+        if not self.dosya or not os.path.exists(self.dosya):
+            return
+        try:
+            with open(self.dosya, 'r', encoding='utf-8') as f:
+                veri = json.load(f)
+            self.etiketler = veri.get('etiketler', {})
+            self.isitma_zamani = veri.get('isitma_zamani', 0)
+        except Exception as e:
+            print(f"❌ Etiket önbelleği okunamadı: {e}")
+
+    def _diske_yaz(self):
+        if not self.dosya:
+            return
+        with self._kilit:
+            veri = {'isitma_zamani': self.isitma_zamani, 'etiketler': dict(self.etiketler)}
+        try:
+            with self._yazma_kilidi:
+                gecici = self.dosya + '.tmp'
+                with open(gecici, 'w', encoding='utf-8') as f:
+                    json.dump(veri, f, ensure_ascii=False)
+                os.replace(gecici, self.dosya)
+        except Exception as e:
+            print(f"❌ Etiket önbelleği yazma hatası: {e}")
+
+    def isitma_gerekli_mi(self):
+        return time.time() - self.isitma_zamani > self.yenileme_saat * 3600
+
+    def arka_planda_isit(self):
+        """Isıtma gerekiyorsa ve çalışmıyorsa arka planda başlat"""
+        with self._kilit:
+            if self._isitiliyor or not self.isitma_gerekli_mi():
+                return
+            self._isitiliyor = True
+        threading.Thread(target=self.isit, name='etiket-isit', daemon=True).start()
+
+    def isit(self):
+        """Tüm etiket listesini çekip önbelleği yeniden kur
+
+        WordPress'te silinen etiketler listede olmadığı için önbellekten düşer.
+        """
+        with self._kilit:
+            self._isitiliyor = True
+            self._isitma_sirasinda = {}
+        try:
+            etiketler = tum_sayfalari_cek(self.http, self.url, auth=self.auth,
+                                          params={'_fields': 'id,name'})
+            if etiketler is None:
+                self.istatistik['hata'] += 1
+                return False
+
+            yeni = {_etiket_anahtari(etiket.get('name')): etiket.get('id') for etiket in etiketler}
+            with self._kilit:
+                yeni.update(self._isitma_sirasinda)
+                self.etiketler = yeni
+                self.isitma_zamani = time.time()
+            self._diske_yaz()
+            print(f"🏷️ Etiket önbelleği ısıtıldı: {len(etiketler)} etiket")
+            return True
+        except Exception as e:
+            self.istatistik['hata'] += 1
+            print(f"❌ Etiket önbelleği ısıtma hatası: {e}")
+            return False
+        finally:
+            with self._kilit:
+                self._isitiliyor = False
+            self._isitma_bitti.set()
+
+    def _wpden_coz(self, ad):
+        """Etiketi WordPress'te ara, yoksa oluştur"""
+        anahtar = _etiket_anahtari(ad)
+        try:
+            response = self.http.get(self.url, auth=self.auth, params={'search': ad, 'per_page': 100})
+            if response.status_code == 200:
+                for tag in response.json():
+                    if _etiket_anahtari(tag.get('name')) == anahtar:
+                        return tag['id']
+
+            create_response = self.http.post(self.url, auth=self.auth, json={'name': ad})
+            if create_response.status_code == 201:
+                self.istatistik['olusturulan'] += 1
+                return create_response.json()['id']
+
+            # Arada başka biri oluşturduysa WordPress mevcut ID'yi döndürür
+            hata = create_response.json() if create_response.content else {}
+            if hata.get('code') == 'term_exists':
+                return (hata.get('data') or {}).get('term_id')
+        except Exception as e:
+            print(f"❌ Etiket çözülemedi ({ad}): {e}")
+
+        self.istatistik['hata'] += 1
+        return None
+
+    def coz(self, adlar):
+        """Etiket adlarını aynı sırada ID'lere çevir (çözülemeyenler None)"""
+        self.arka_planda_isit()
+        if not self.isitma_zamani and self._isitiliyor:
+            # İlk ısıtma sürüyorsa eksikleri tek tek aramak yerine onu bekle
+            self._isitma_bitti.wait(15)
+
+        anahtarlar = [_etiket_anahtari(ad) for ad in adlar]
+        eksikler = {}
+        with self._kilit:
+            for ad, anahtar in zip(adlar, anahtarlar):
+                if not anahtar:
+                    continue
+                if anahtar in self.etiketler:
+                    self.istatistik['isabet'] += 1
+                elif anahtar not in eksikler:
+                    self.istatistik['iskalama'] += 1
+                    eksikler[anahtar] = ad.strip()
+
+        if eksikler:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(eksikler))) as executor:
+                sonuclar = dict(zip(eksikler, executor.map(self._wpden_coz, eksikler.values())))
+            with self._kilit:
+                for anahtar, tag_id in sonuclar.items():
+                    if tag_id:
+                        self.etiketler[anahtar] = tag_id
+                        if self._isitiliyor:
+                            self._isitma_sirasinda[anahtar] = tag_id
+            self._diske_yaz()
+
+        with self._kilit:
+            return [self.etiketler.get(anahtar) for anahtar in anahtarlar]
+
+    def idleri_dusur(self, tag_idleri):
+        """WordPress'in reddettiği (silinmiş) etiket ID'lerini önbellekten çıkar"""
+        tag_idleri = set(tag_idleri)
+        with self._kilit:
+            dusen = [anahtar for anahtar, tag_id in self.etiketler.items() if tag_id in tag_idleri]
+            for anahtar in dusen:
+                del self.etiketler[anahtar]
+                self._isitma_sirasinda.pop(anahtar, None)
+        if dusen:
+            self._diske_yaz()
+            print(f"🏷️ Geçersiz etiketler önbellekten çıkarıldı: {', '.join(dusen)}")
+        return len(dusen)
+
+    def durum(self):
+        return dict(self.istatistik,
+                    adet=len(self.etiketler),
+                    isitma_zamani=time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.isitma_zamani))
+                    if self.isitma_zamani else None,
+                    isitiliyor=self._isitiliyor)
@@ -0,0 +1,316 @@
+import hashlib
+import html
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+import requests
+
+MIME_TURLERI = {'.jpg': 'image/jpeg', '.jpeg': 'image/jpeg', '.png': 'image/png',
+                '.gif': 'image/gif', '.webp': 'image/webp', '.bmp': 'image/bmp'}
+
+class GeciciHata(Exception):
+    """Tekrar denenebilir WordPress hatası (bağlantı, zaman aşımı, 429/5xx)"""
+
+class GecersizEtiket(Exception):
+    """WordPress yazıdaki etiket ID'lerini reddetti (etiket silinmiş olabilir)"""
+
+class GecersizMedya(Exception):
+    """WordPress kapak medya ID'sini reddetti (medya silinmiş olabilir)"""
+
+def _medya_hatasi_mi(response):
+    try:
+        hata = response.json()
+    except ValueError:
+        return False
+    params = (hata.get('data') or {}).get('params') or {}
+    return hata.get('code') == 'rest_invalid_featured_media' or 'featured_media' in params
+
+def _etiket_hatasi_mi(response):
+    try:
+        hata = response.json()
+    except ValueError:
+        return False
+    params = (hata.get('data') or {}).get('params') or {}
+    return 'tags' in params or hata.get('code') in ('rest_invalid_term_id', 'rest_term_invalid')
+
+def _ms(baslangic):
+    return round((time.perf_counter() - baslangic) * 1000, 1)
+
+def dosya_hash(dosya_yolu):
+    h = hashlib.sha1()
+    with open(dosya_yolu, 'rb') as f:
+        for parca in iter(lambda: f.read(1024 * 1024), b''):
+            h.update(parca)
+    return h.hexdigest()
+
+class YayinHatti:
+    """WordPress yayın hattı: kapak yükleme ve etiket çözümleme paralel, sonra yazı
+
+    Tekrar denemeler idempotenttir: yüklenen medya dosya hash'iyle, oluşturulan
+    yazı içerik anahtarıyla kaydedilir. Yanıtı kaybolan bir istekten sonra
+    tekrar denemeden önce WordPress'te aynı medya/yazı aranır, böylece aynı
+    haber iki kez yayınlanmaz.
+    """
+
+    def __init__(self, http, wordpress_url, auth, etiket_onbellegi,
+                 dosya='yayin_kayitlari.json', deneme=3, bekleme=1.0):
+        self.http = http
+        self.wordpress_url = wordpress_url
+        self.auth = auth
+        self.etiket_onbellegi = etiket_onbellegi
+        self.dosya = dosya
+        self.deneme = deneme
+        self.bekleme = bekleme
+        self._kilit = threading.Lock()
+        self._anahtar_kilitleri = {}
+        self.kayitlar = self._yukle()
+
+    def _yukle(self):
+        kayitlar = {'medya': {}, 'yazilar': {}}
+        if self.dosya and os.path.exists(self.dosya):
+            try:
+                with open(self.dosya, 'r', encoding='utf-8') as f:
+                    kayitlar.update(json.load(f))
+            except Exception as e:
+                print(f"❌ Yayın kayıtları okunamadı: {e}")
+        return kayitlar
+
+    def _kaydet(self, tur, anahtar, deger):
+        with self._kilit:
+            self.kayitlar[tur][anahtar] = deger
+        self._kaydet_disk()
+
+    def _kaydet_disk(self):
+        with self._kilit:
+            if not self.dosya:
+                return
+            try:
+                gecici = self.dosya + '.tmp'
+                with open(gecici, 'w', encoding='utf-8') as f:
+                    json.dump(self.kayitlar, f, ensure_ascii=False, indent=2)
+                os.replace(gecici, self.dosya)
+            except Exception as e:
+                print(f"❌ Yayın kayıtları yazma hatası: {e}")
+
+    def _sil(self, tur, anahtar):
+        with self._kilit:
+            if self.kayitlar[tur].pop(anahtar, None) is None:
+                return
+        self._kaydet_disk()
+
+    def _tekrarla(self, islem, onceki_sonucu_bul=None):
+        """İşlemi geçici hatalarda tekrar dene; ikinci denemeden itibaren önce
+        önceki denemenin WordPress'te sonuç bırakıp bırakmadığına bak"""
+        for deneme in range(1, self.deneme + 1):
+            if deneme > 1 and onceki_sonucu_bul:
+                sonuc = onceki_sonucu_bul()
+                if sonuc is not None:
+                    return sonuc
+            try:
+                return islem()
+            except (GeciciHata, requests.RequestException) as e:
+                print(f"⚠️ WordPress isteği başarısız ({deneme}/{self.deneme}): {e}")
+                if deneme == self.deneme:
+                    raise
+                time.sleep(self.bekleme * deneme)
+
+    def _yanit_kontrol(self, response, beklenen=201):
+        if response.status_code == beklenen:
+            return response.json()
+        if response.status_code == 429 or response.status_code >= 500:
+            raise GeciciHata(f"HTTP {response.status_code}")
+        return None
+
+    # ======= MEDYA =======
+
+    def medya_yukle(self, dosya_yolu):
+        """Kapak fotoğrafını yükle; aynı dosya daha önce yüklendiyse ID'sini döndür"""
+        if not dosya_yolu or not os.path.exists(dosya_yolu):
+            return None
+
+        hash_degeri = dosya_hash(dosya_yolu)
+        medya_id = self.kayitlar['medya'].get(hash_degeri)
+        if medya_id:
+            return medya_id
+
+        # Dosya adındaki hash, yanıtı kaybolan yüklemeyi tekrar denemeden önce bulmayı sağlar
+        dosya_adi = f"{hash_degeri[:12]}-{os.path.basename(dosya_yolu)}"
+        content_type = MIME_TURLERI.get(os.path.splitext(dosya_adi)[1].lower(), 'image/jpeg')
+
+        def yukle():
+            with open(dosya_yolu, 'rb') as f:
+                response = self.http.post(f'{self.wordpress_url}/wp-json/wp/v2/media', auth=self.auth,
+                                          headers={'Content-Type': content_type,
+                                                   'Content-Disposition': f'attachment; filename="{dosya_adi}"'},
+                                          data=f.read())
+            veri = self._yanit_kontrol(response)
+            return veri.get('id') if veri else None
+
+        def onceki_yuklemeyi_bul():
+            response = self.http.get(f'{self.wordpress_url}/wp-json/wp/v2/media', auth=self.auth,
+                                     params={'search': hash_degeri[:12], '_fields': 'id,source_url'})
+            if response.status_code == 200:
+                for medya in response.json():
+                    if hash_degeri[:12] in medya.get('source_url', ''):
+                        return medya.get('id')
+            return None
+
+        medya_id = self._tekrarla(yukle, onceki_yuklemeyi_bul)
+        if medya_id:
+            self._kaydet('medya', hash_degeri, medya_id)
+        return medya_id
+
+    # ======= YAZI =======
+
+    def _yazi_anahtari(self, baslik, icerik, etiketler, kategori_id, resim_yolu):
+        parcalar = [baslik, icerik, '|'.join(etiketler or []), str(kategori_id or ''),
+                    dosya_hash(resim_yolu) if resim_yolu and os.path.exists(resim_yolu) else '']
+        return hashlib.sha1('\x1f'.join(parcalar).encode('utf-8')).hexdigest()
+
+    def _yazi_olustur(self, baslik, veri):
+        # Tekrar denemede sadece bu yayın başladıktan sonra oluşan yazılar bizimdir;
+        # aynı başlıklı eski bir yazı bu yayının sonucu sayılmaz (saat farkı için 2 dk pay)
+        baslangic = datetime.now(timezone.utc) - timedelta(minutes=2)
+
+        def olustur():
+            response = self.http.post(f'{self.wordpress_url}/wp-json/wp/v2/posts', auth=self.auth, json=veri)
+            sonuc = self._yanit_kontrol(response)
+            if sonuc is None:
+                if response.status_code == 400 and veri.get('tags') and _etiket_hatasi_mi(response):
+                    raise GecersizEtiket(response.text)
+                if response.status_code == 400 and veri.get('featured_media') and _medya_hatasi_mi(response):
+                    raise GecersizMedya(response.text)
+                raise ValueError(f"HTTP {response.status_code}: {response.text}")
+            return sonuc
+
+        def onceki_yaziyi_bul():
+            response = self.http.get(f'{self.wordpress_url}/wp-json/wp/v2/posts', auth=self.auth,
+                                     params={'search': baslik, 'per_page': 10, 'status': 'publish',
+                                             'orderby': 'date', '_fields': 'id,link,title,date_gmt'})
+            if response.status_code == 200:
+                # Başka bir yayının kayıtlı sonucu olan yazılar bu denemenin sonucu olamaz
+                with self._kilit:
+                    bilinenler = {kayit.get('post_id') for kayit in self.kayitlar['yazilar'].values()}
+                for yazi in response.json():
+                    if yazi.get('id') in bilinenler:
+                        continue
+                    if html.unescape(yazi.get('title', {}).get('rendered', '')).strip() != baslik.strip():
+                        continue
+                    try:
+                        tarih = datetime.fromisoformat(yazi.get('date_gmt', '')).replace(tzinfo=timezone.utc)
+                    except ValueError:
+                        continue
+                    if tarih >= baslangic:
+                        return yazi
+            return None
+
+        return self._tekrarla(olustur, onceki_yaziyi_bul)
+
+    def _yazi_var_mi(self, post_id):
+        """Kayıtlı yazı WordPress'te hâlâ duruyor mu (silinmiş/çöpte ise False)"""
+        if not post_id:
+            return True
+        try:
+            response = self.http.get(f'{self.wordpress_url}/wp-json/wp/v2/posts/{post_id}', auth=self.auth,
+                                     params={'_fields': 'id,status'})
+        except requests.RequestException:
+            return True  # Doğrulanamadı: tekrar yayınlamaktansa kayda güven
+        if response.status_code in (404, 410):
+            return False
+        if response.status_code == 200:
+            return response.json().get('status') != 'trash'
+        return True
+
+    def yayinla(self, baslik, icerik, etiketler, kategori_id=None, resim_yolu=None, zorla=False):
+        """Haberi yayınla; sonuçta aşama süreleri (ms) de döner
+
+        Aynı içerik daha önce yayınlandıysa ve yazı WordPress'te duruyorsa
+        tekrar yayınlanmaz; zorla=True ise kayıt yok sayılır.
+        """
+        toplam_baslangic = time.perf_counter()
+        sureler = {}
+        anahtar = self._yazi_anahtari(baslik, icerik, etiketler, kategori_id, resim_yolu)
+
+        with self._kilit:
+            anahtar_kilidi = self._anahtar_kilitleri.setdefault(anahtar, threading.Lock())
+
+        # Aynı haberin eşzamanlı ikinci yayın isteği birincinin sonucunu bekler
+        with anahtar_kilidi:
+            onceki = None if zorla else self.kayitlar['yazilar'].get(anahtar)
+            if onceki and not self._yazi_var_mi(onceki.get('post_id')):
+                print(f"🗑️ Kayıtlı yazı WordPress'te yok (#{onceki.get('post_id')}), yeniden yayınlanıyor")
+                self._sil('yazilar', anahtar)
+                onceki = None
+            if onceki:
+                sureler['toplam_ms'] = _ms(toplam_baslangic)
+                return {'success': True, 'link': onceki.get('link', 'Link alınamadı'),
+                        'tekrar': True, 'sureler': sureler}
+
+            def zamanla(ad, islem, *args):
+                baslangic = time.perf_counter()
+                try:
+                    return islem(*args)
+                finally:
+                    sureler[ad] = _ms(baslangic)
+
+            # Kapak yükleme ve etiket çözümleme birbirinden bağımsız
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                medya_gorevi = executor.submit(zamanla, 'medya_ms', self.medya_yukle, resim_yolu)
+                etiket_gorevi = executor.submit(zamanla, 'etiket_ms', self.etiket_onbellegi.coz, etiketler)
+                kapak_fotografi_id = medya_gorevi.result()
+                tag_ids = [tag_id for tag_id in etiket_gorevi.result() if tag_id]
+
+            veri = {
+                'title': baslik,
+                'content': icerik,
+                'status': 'publish',
+                'tags': tag_ids
+            }
+            if kategori_id:
+                veri['categories'] = [kategori_id]
+            if kapak_fotografi_id:
+                veri['featured_media'] = kapak_fotografi_id
+
+            # Önbellekteki etiket/medya ID'leri eskimiş olabilir: her biri için bir kez düzeltip tekrar dene
+            duzeltilen = set()
+            while True:
+                try:
+                    yazi = zamanla('yazi_ms', self._yazi_olustur, baslik, veri)
+                    break
+                except GecersizEtiket:
+                    if 'etiket' in duzeltilen:
+                        raise
+                    duzeltilen.add('etiket')
+                    # Düşür, etiketleri WordPress'ten yeniden çöz
+                    self.etiket_onbellegi.idleri_dusur(veri['tags'])
+                    veri['tags'] = [tag_id for tag_id in self.etiket_onbellegi.coz(etiketler) if tag_id]
+                except GecersizMedya:
+                    if 'medya' in duzeltilen:
+                        raise
+                    duzeltilen.add('medya')
+                    # Kapak WordPress'ten silinmiş: kaydı düşür, dosyayı yeniden yükle
+                    print(f"🗑️ Kapak medyası WordPress'te yok (#{veri['featured_media']}), yeniden yükleniyor")
+                    self._sil('medya', dosya_hash(resim_yolu))
+                    kapak_fotografi_id = self.medya_yukle(resim_yolu)
+                    if kapak_fotografi_id:
+                        veri['featured_media'] = kapak_fotografi_id
+                    else:
+                        veri.pop('featured_media')
+
+            # WordPress bilinmeyen ID'leri sessizce atlarsa da önbellekten düşür
+            if 'tags' in yazi:
+                atlanan = set(veri['tags']) - set(yazi['tags'])
+                if atlanan:
+                    self.etiket_onbellegi.idleri_dusur(atlanan)
+            link = yazi.get('link', 'Link alınamadı')
+            self._kaydet('yazilar', anahtar, {'post_id': yazi.get('id'), 'link': link,
+                                              'zaman': time.strftime('%Y-%m-%d %H:%M:%S')})
+
+        sureler['toplam_ms'] = _ms(toplam_baslangic)
+        print(f"📤 Yayınlandı: medya {sureler.get('medya_ms')} ms, etiket {sureler.get('etiket_ms')} ms, "
+              f"yazı {sureler.get('yazi_ms')} ms, toplam {sureler['toplam_ms']} ms")
+        return {'success': True, 'link': link, 'tekrar': False, 'sureler': sureler}
@@ -0,0 +1,101 @@
+import random
+import threading
+import time
+from datetime import datetime
+
+class HaberZamanlayici:
+    """Scrape işlemini uygulama içinde arka planda periyodik çalıştırır
+
+    Her kaynağın kendi aralığı olabilir (settings.source_intervals), yoksa
+    settings.check_interval kullanılır. Aralıklara jitter eklenir; aynı anda
+    vadesi gelen (veya yaklaşan) kaynaklar tek döngüde birlikte çekilir.
+    """
+
+    def __init__(self, yonetici, config):
+        self.yonetici = yonetici
+        settings = (config or {}).get('settings', {})
+
+        self.varsayilan_aralik = settings.get('check_interval', 3600)
+        self.kaynak_araliklari = settings.get('source_intervals', {})
+        self.jitter = settings.get('check_jitter', 0.1)
+        # Vadesine bu kadar saniye kalan kaynaklar da aynı döngüye alınır
+        self.birlestirme = settings.get('check_coalesce', 60)
+        # Elle başlatılan yenileme sürüyorsa döngü bu kadar sonra tekrar denenir
+        self.tekrar_deneme = settings.get('check_retry_delay', 30)
+
+        self.kaynaklar = self.yonetici.aktif_kaynaklar()
+        simdi = time.time()
+        self.sonraki = {kaynak: simdi for kaynak in self.kaynaklar}  # İlk döngü hemen
+
+        self.son_calisma = None
+        self.son_sonuc = None
+        self.calisiyor = False
+        self._dur = threading.Event()
+        self._thread = None
+
+    def aralik(self, kaynak):
+        aralik = self.kaynak_araliklari.get(kaynak, self.varsayilan_aralik)
+        return aralik * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def baslat(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._dur.clear()
+        self._thread = threading.Thread(target=self._dongu, name='haber-zamanlayici', daemon=True)
+        self._thread.start()
+        print(f"⏰ Zamanlayıcı başladı ({len(self.kaynaklar)} kaynak, varsayılan {self.varsayilan_aralik} sn)")
+
+    def durdur(self):
+        self._dur.set()
+
+    def _dongu(self):
+        while not self._dur.is_set():
+            simdi = time.time()
+            vadesi_gelen = [k for k, zaman in self.sonraki.items()
+                            if zaman <= simdi + self.birlestirme]
+
+            if vadesi_gelen:
+                if self._calistir(vadesi_gelen):
+                    for kaynak in vadesi_gelen:
+                        self.sonraki[kaynak] = time.time() + self.aralik(kaynak)
+                else:
+                    # Döngü atlandı: vadeler ilerletilmez, kısa süre sonra tekrar
+                    for kaynak in vadesi_gelen:
+                        self.sonraki[kaynak] = time.time() + self.tekrar_deneme
+
+            if not self.sonraki:
+                return
+            bekleme = max(1, min(self.sonraki.values()) - time.time())
+            self._dur.wait(bekleme)
+
+    def _calistir(self, kaynaklar):
+        """Kaynakları çek; başka bir yenileme sürdüğü için atlandıysa False"""
+        if self.yonetici.yenileme_devam_ediyor():
+            print(f"⏳ Yenileme sürüyor, zamanlanmış döngü {self.tekrar_deneme} sn sonra denenecek")
+            return False
+
+        self.calisiyor = True
+        baslangic = time.time()
+        try:
+            basarili, yeni_sayisi = self.yonetici.haberleri_yenile(kaynaklar=kaynaklar)
+            if not basarili and self.yonetici.yenileme_devam_ediyor():
+                # Kontrolden hemen sonra elle yenileme başladı
+                self.calisiyor = False
+                return False
+            self.son_sonuc = {'basarili': basarili, 'yeni_haber': yeni_sayisi, 'kaynaklar': kaynaklar,
+                              'sure': round(time.time() - baslangic, 1)}
+        except Exception as e:
+            print(f"❌ Zamanlayıcı hatası: {e}")
+            self.son_sonuc = {'basarili': False, 'hata': str(e), 'kaynaklar': kaynaklar}
+        self.calisiyor = False
+        self.son_calisma = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        return True
+
+    def durum(self):
+        return {
+            'calisiyor': self.calisiyor,
+            'son_calisma': self.son_calisma,
+            'son_sonuc': self.son_sonuc,
+            'sonraki': {k: datetime.fromtimestamp(v).strftime('%Y-%m-%d %H:%M:%S')
+                        for k, v in self.sonraki.items()}
+        }